@@ -1,6 +1,9 @@
 """Profile management API endpoints for SecureHR application."""
 
+import asyncio
 import logging
+import shutil
+import tempfile
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
@@ -20,6 +23,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
+# Queued CV uploads are kept in memory up to 2MB, then spooled to disk
+CV_SPOOL_MAX_SIZE = 2 * 1024 * 1024
+
 
 class ProfileUpdateRequest(BaseModel):
     """Request model for updating candidate profile."""
@@ -265,13 +271,30 @@ async def replace_cv(
         )
     
     try:
-        # Queue the CV replacement for processing
-        task_id = await upload_queue_manager.queue_upload(
-            candidate_id=current_user.id,
-            file=file,
-            processor_func=_process_cv_replacement,
-            db=db
-        )
+        # Copy the upload into a spooled file owned by the queued task, so memory
+        # stays bounded and processing does not depend on the request's upload
+        spool = tempfile.SpooledTemporaryFile(max_size=CV_SPOOL_MAX_SIZE)
+        try:
+            await asyncio.to_thread(shutil.copyfileobj, file.file, spool)
+            spool.seek(0)
+            queued_file = UploadFile(
+                file=spool,
+                size=file.size,
+                filename=file.filename,
+                headers=file.headers
+            )
+            
+            # Queue the CV replacement for processing
+            task_id = await upload_queue_manager.queue_upload(
+                candidate_id=current_user.id,
+                file=queued_file,
+                processor_func=_process_cv_replacement,
+                db=db
+            )
+        except Exception:
+            # The queued task only closes the spool once it has been queued
+            spool.close()
+            raise
         
         # Set processing status to pending
         current_user.cv_processing_status = CVProcessingStatus.PENDING
@@ -391,6 +414,10 @@ async def _process_cv_replacement(file: UploadFile, candidate_id: str, db: Sessi
         
         logger.error(f"CV replacement failed for candidate {candidate_id}: {e}")
         raise
+    
+    finally:
+        # Release the spooled copy made when the replacement was queued
+        await file.close()
 
 
 @router.delete("/me", response_model=ProfileDeleteResponse)
@@ -2,7 +2,7 @@
 
 import logging
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.security import HTTPBearer
@@ -19,7 +19,7 @@ from ..models.search import (
 )
 from ..services.search_service import SearchService
 from ..services.saved_search_service import SavedSearchService
-from ..services.advanced_search_service import AdvancedSearchService
+from ..services.advanced_search_service import AdvancedSearchService, RawSearchResult
 from ..services.cyborgdb_service import CyborgDBService
 
 logger = logging.getLogger(__name__)
@@ -401,6 +401,7 @@ async def create_saved_search(
 async def get_saved_searches(
     limit: int = Query(default=50, ge=1, le=100, description="Maximum number of searches to return"),
     offset: int = Query(default=0, ge=0, description="Number of searches to skip"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page (replaces offset)"),
     current_user: Recruiter = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> SavedSearchListResponse:
@@ -410,6 +411,7 @@ async def get_saved_searches(
     Args:
         limit: Maximum number of searches to return
         offset: Number of searches to skip
+        cursor: Keyset cursor from the previous page's next_cursor
         current_user: The authenticated recruiter user
         db: Database session
         
@@ -434,7 +436,8 @@ async def get_saved_searches(
         saved_searches = saved_search_service.get_saved_searches(
             recruiter_id=current_user.id,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
         
         logger.info(f"Retrieved {len(saved_searches.searches)} saved searches for recruiter {current_user.id}")
@@ -806,35 +809,21 @@ async def export_search_results(
             filters=search_criteria.filters
         )
         
-        # Convert to SearchResponse format
-        search_results = search_data.get("results", [])
-        processed_results = []
-        for result in search_results:
-            search_result = SearchResult(
-                candidate_id=result["candidate_id"],
-                similarity_score=result["similarity_score"],
-                first_name=result.get("first_name"),
-                last_name=result.get("last_name"),
-                email=result.get("email"),
-                matched_skills=result.get("metadata", {}).get("skills"),
-                experience_level=result.get("metadata", {}).get("experience_level")
-            )
-            processed_results.append(search_result)
+        # Exports never leave the server as SearchResult models, so skip per-row validation
+        rows = [
+            RawSearchResult.from_search_hit(result)
+            for result in search_data.get("results", [])
+        ]
         
         processed_query = search_service.preprocess_search_query(search_criteria.requirements)
         
-        search_response = SearchResponse(
-            results=processed_results,
-            total_results=len(processed_results),
-            query_processed=processed_query,
-            search_time_ms=0.0
-        )
-        
         # Export results
-        export_response = advanced_search_service.export_search_results(
-            results=search_response,
+        export_response = advanced_search_service.export_raw_results(
+            rows=rows,
+            query_processed=processed_query,
             export_request=export_request,
-            recruiter_id=current_user.id
+            recruiter_id=current_user.id,
+            search_time_ms=0.0
         )
         
         logger.info(f"Exported search results for recruiter {current_user.id}: {export_response.total_results} results")
@@ -29,10 +29,15 @@ async def get_security_alerts(
     limit: int = Query(50, ge=1, le=100),
     resolved: Optional[bool] = Query(None),
     level: Optional[str] = Query(None),
+    alert_type: Optional[str] = Query(None),
     current_user: BaseUser = Depends(get_current_user)
 ) -> List[Dict]:
     """Get security alerts (admin only)."""
-    alerts = security_monitor.alerts
+    # Filter by alert type through the monitor's type index
+    if alert_type:
+        alerts = security_monitor.alerts_of_type(alert_type)
+    else:
+        alerts = security_monitor.alerts
     
     # Filter by resolved status
     if resolved is not None:
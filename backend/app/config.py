@@ -54,6 +54,9 @@ class Settings:
     max_connections_per_ip: int = int(os.getenv("MAX_CONNECTIONS_PER_IP", "50"))
     ddos_suspicious_threshold: int = int(os.getenv("DDOS_SUSPICIOUS_THRESHOLD", "100"))
     ddos_block_duration_seconds: int = int(os.getenv("DDOS_BLOCK_DURATION_SECONDS", "300"))
+    
+    # Audit logging
+    audit_sample_rate: float = float(os.getenv("AUDIT_SAMPLE_RATE", "0.1"))
 
     # Development
     debug: bool = os.getenv("DEBUG", "True").lower() == "true"
@@ -15,6 +15,7 @@ if "sqlite" in settings.database_url:
     engine = create_engine(
         settings.database_url,
         echo=settings.debug,
+        connect_args={"check_same_thread": False},  # Sessions may flush from worker threads
         poolclass=StaticPool,
     )
 else:
@@ -7,10 +7,10 @@ from collections import defaultdict, deque
 from fastapi import Request, Response, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import RedirectResponse
-import re
 import html
 
 from app.services.monitoring_service import security_monitor
+from app.utils.validation import compile_pattern_union
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -239,10 +239,16 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
             r"%2e%2e%2f",
             r"%2e%2e\\",
         ]
+        
+        # Each check is a single scan over the union of its patterns
+        self._path_traversal_re = compile_pattern_union(tuple(self.path_traversal_patterns))
+        self._malicious_input_re = compile_pattern_union(tuple(
+            self.sql_injection_patterns + self.xss_patterns + self.path_traversal_patterns
+        ))
     
     async def dispatch(self, request: Request, call_next):
         # Validate request path
-        if self._contains_malicious_patterns(request.url.path, self.path_traversal_patterns):
+        if self._path_traversal_re.search(request.url.path):
             logger.warning(f"Path traversal attempt detected: {request.url.path}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -292,27 +298,8 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
         if not isinstance(input_string, str):
             return False
         
-        # Check for SQL injection
-        if self._contains_malicious_patterns(input_string, self.sql_injection_patterns):
-            return True
-        
-        # Check for XSS
-        if self._contains_malicious_patterns(input_string, self.xss_patterns):
-            return True
-        
-        # Check for path traversal
-        if self._contains_malicious_patterns(input_string, self.path_traversal_patterns):
-            return True
-        
-        return False
-    
-    def _contains_malicious_patterns(self, text: str, patterns: list) -> bool:
-        """Check if text contains any malicious patterns."""
-        text_lower = text.lower()
-        for pattern in patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                return True
-        return False
+        # SQL injection, XSS and path traversal patterns in one pass
+        return self._malicious_input_re.search(input_string) is not None
     
     def sanitize_input(self, input_string: str) -> str:
         """Sanitize input string by escaping HTML and removing dangerous characters."""
@@ -1,6 +1,6 @@
 """SQLAlchemy database models for SecureHR application."""
 
-from sqlalchemy import Column, String, DateTime, Boolean, Enum as SQLEnum, Text, JSON, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, Enum as SQLEnum, Text, JSON, ForeignKey, LargeBinary, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -56,7 +56,7 @@ class CVVectorDB(Base):
     cyborgdb_vector_id = Column(String, nullable=False, index=True)  # Reference to vector in CyborgDB
     vector_dimensions = Column(String, nullable=False)  # Store as string for flexibility
     original_filename = Column(String, nullable=True)  # Original CV filename
-    file_hash = Column(String, nullable=True)  # Hash of original file for integrity checking
+    file_hash = Column(LargeBinary(32), nullable=True)  # Raw SHA256 digest of original file for integrity checking
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -78,5 +78,11 @@ class SavedSearchDB(Base):
     last_used_at = Column(DateTime(timezone=True), nullable=True)
     use_count = Column(String, default="0", nullable=False)  # Number of times used
 
+    __table_args__ = (
+        # Duplicate-name checks and newest-first listings both filter on recruiter first
+        Index("idx_saved_searches_recruiter_name", "recruiter_id", "name", unique=True),
+        Index("idx_saved_searches_recruiter_created", "recruiter_id", "created_at"),
+    )
+
     def __repr__(self):
         return f"<SavedSearch(id={self.id}, name={self.name}, recruiter_id={self.recruiter_id})>"
\ No newline at end of file
@@ -4,6 +4,10 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
+import hashlib
+
+import orjson
 
 
 class ExportFormat(str, Enum):
@@ -19,6 +23,33 @@ class SearchRequest(BaseModel):
     filters: Optional[Dict[str, Any]] = Field(default=None, description="Optional search filters")
     limit: Optional[int] = Field(default=10, ge=1, le=100, description="Maximum number of results")
 
+    @cached_property
+    def cache_key(self) -> bytes:
+        """
+        16-byte BLAKE2b fingerprint of the search parameters, computed once per request.
+        
+        Reassigning a field resets it, but mutating filters in place does not:
+        assign a new dict to filters instead of editing the existing one.
+        """
+        key_data = {
+            "requirements": self.requirements,
+            "filters": self.filters or {},
+            "limit": self.limit or 10
+        }
+        key_bytes = orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(key_bytes, digest_size=16).digest()
+
+    def __setattr__(self, name: str, value: Any):
+        """Drop the cached cache_key whenever a field changes."""
+        super().__setattr__(name, value)
+        self.__dict__.pop("cache_key", None)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "SearchRequest":
+        """Copy the request without carrying over a cache_key computed for the original."""
+        copied = super().model_copy(update=update, deep=deep)
+        copied.__dict__.pop("cache_key", None)
+        return copied
+
 
 class SearchResult(BaseModel):
     """Individual search result model."""
@@ -77,6 +108,7 @@ class SavedSearchListResponse(BaseModel):
     """Response model for listing saved searches."""
     searches: List[SavedSearchResponse] = Field(..., description="List of saved searches")
     total_count: int = Field(..., description="Total number of saved searches")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page, if there may be one")
 
 
 class SearchHistoryEntry(BaseModel):
@@ -12,7 +12,7 @@ class CVVector(BaseModel):
     cyborgdb_vector_id: str  # Reference to vector stored in CyborgDB
     vector_dimensions: int
     original_filename: Optional[str] = None
-    file_hash: Optional[str] = None  # Hash of original file for integrity
+    file_hash: Optional[bytes] = None  # Raw SHA256 digest of original file for integrity
     created_at: datetime
     last_updated_at: datetime
 
@@ -23,7 +23,7 @@ class CVVectorCreateRequest(BaseModel):
     cyborgdb_vector_id: str
     vector_dimensions: int
     original_filename: Optional[str] = None
-    file_hash: Optional[str] = None
+    file_hash: Optional[bytes] = None
 
 
 class CVVectorResponse(BaseModel):
@@ -33,7 +33,7 @@ class CVVectorResponse(BaseModel):
     cyborgdb_vector_id: str
     vector_dimensions: int
     original_filename: Optional[str] = None
-    file_hash: Optional[str] = None
+    file_hash: Optional[bytes] = None
     created_at: datetime
     last_updated_at: datetime
     
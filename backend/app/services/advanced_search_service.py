@@ -1,14 +1,19 @@
 """Advanced search service for SecureHR application."""
 
-import json
 import csv
 import io
-import hashlib
 import logging
+import time
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from collections import Counter
+from collections import Counter, OrderedDict
+from itertools import islice
+from operator import attrgetter
 import uuid
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import orjson
 
 from ..models.search import (
     SearchRequest, SearchResponse, SearchResult,
@@ -18,9 +23,27 @@ from ..models.search import (
 
 logger = logging.getLogger(__name__)
 
+# Words ignored when extracting search keywords for analytics
+KEYWORD_STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with",
+    "by", "is", "are", "was", "were", "be", "been", "have", "has", "had", "do", "does",
+    "did", "will", "would", "could", "should", "may", "might", "must", "can", "shall"
+})
+
+# Punctuation stripped from the ends of each keyword
+KEYWORD_STRIP_CHARS = ".,!?;:()[]{}\"'"
+
+# Number of keywords recorded per search
+MAX_KEYWORDS = 10
+
+# Number of most recent searches kept for analytics
+SEARCH_HISTORY_MAX_ENTRIES = 10000
+
+SECONDS_PER_DAY = 86400
+
 
 class SearchCache:
-    """Simple in-memory search cache."""
+    """Simple in-memory LRU search cache."""
     
     def __init__(self, max_size: int = 1000, ttl_seconds: int = 3600):
         """
@@ -32,27 +55,8 @@ class SearchCache:
         """
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.access_times: Dict[str, datetime] = {}
-    
-    def _generate_cache_key(self, search_request: SearchRequest) -> str:
-        """
-        Generate cache key from search request.
-        
-        Args:
-            search_request: Search request to generate key for
-            
-        Returns:
-            Cache key string
-        """
-        # Create a deterministic key from search parameters
-        key_data = {
-            "requirements": search_request.requirements,
-            "filters": search_request.filters or {},
-            "limit": search_request.limit or 10
-        }
-        key_string = json.dumps(key_data, sort_keys=True)
-        return hashlib.md5(key_string.encode()).hexdigest()
+        # Cache key -> (last access time, results), least recently used first
+        self._store: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
     
     def get(self, search_request: SearchRequest) -> Optional[Dict[str, Any]]:
         """
@@ -64,24 +68,26 @@ class SearchCache:
         Returns:
             Cached results or None if not found/expired
         """
-        cache_key = self._generate_cache_key(search_request)
+        cache_key = search_request.cache_key
         
-        if cache_key not in self.cache:
+        entry = self._store.get(cache_key)
+        if entry is None:
             return None
         
         # Check if entry has expired
-        cached_time = self.access_times.get(cache_key)
-        if cached_time and (datetime.utcnow() - cached_time).total_seconds() > self.ttl_seconds:
+        cached_time, results = entry
+        now = time.monotonic()
+        if now - cached_time > self.ttl_seconds:
             # Remove expired entry
-            del self.cache[cache_key]
-            del self.access_times[cache_key]
+            del self._store[cache_key]
             return None
         
-        # Update access time
-        self.access_times[cache_key] = datetime.utcnow()
+        # Update access time and mark as most recently used
+        self._store[cache_key] = (now, results)
+        self._store.move_to_end(cache_key)
         
-        logger.info(f"Cache hit for search key: {cache_key[:8]}...")
-        return self.cache[cache_key]
+        logger.info(f"Cache hit for search key: {cache_key.hex()[:8]}...")
+        return results
     
     def set(self, search_request: SearchRequest, results: Dict[str, Any]):
         """
@@ -91,24 +97,20 @@ class SearchCache:
             search_request: Search request to cache
             results: Search results to cache
         """
-        cache_key = self._generate_cache_key(search_request)
+        cache_key = search_request.cache_key
         
-        # Remove oldest entries if cache is full
-        if len(self.cache) >= self.max_size:
-            # Remove oldest entry
-            oldest_key = min(self.access_times.keys(), key=lambda k: self.access_times[k])
-            del self.cache[oldest_key]
-            del self.access_times[oldest_key]
+        self._store[cache_key] = (time.monotonic(), results)
+        self._store.move_to_end(cache_key)
         
-        self.cache[cache_key] = results
-        self.access_times[cache_key] = datetime.utcnow()
+        # Remove least recently used entries if cache is full
+        while len(self._store) > self.max_size:
+            self._store.popitem(last=False)
         
-        logger.info(f"Cached search results for key: {cache_key[:8]}...")
+        logger.info(f"Cached search results for key: {cache_key.hex()[:8]}...")
     
     def clear(self):
         """Clear all cached entries."""
-        self.cache.clear()
-        self.access_times.clear()
+        self._store.clear()
         logger.info("Search cache cleared")
     
     def get_stats(self) -> Dict[str, Any]:
@@ -118,21 +120,298 @@ class SearchCache:
         Returns:
             Cache statistics
         """
+        cached_results = [results for _, results in self._store.values()]
         return {
-            "total_entries": len(self.cache),
+            "total_entries": len(self._store),
             "max_size": self.max_size,
             "ttl_seconds": self.ttl_seconds,
-            "memory_usage_estimate_mb": len(json.dumps(self.cache).encode()) / (1024 * 1024)
+            "memory_usage_estimate_mb": len(orjson.dumps(cached_results)) / (1024 * 1024)
         }
 
 
+@dataclass(slots=True, frozen=True)
+class RawSearchResult:
+    """Lightweight search result row for internal pipelines such as exports.
+    
+    Carries the same fields as SearchResult without per-row validation or a
+    per-instance __dict__; convert with to_search_result() at the API boundary.
+    """
+    candidate_id: str
+    similarity_score: float
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    matched_skills: Optional[Tuple[str, ...]] = None
+    experience_level: Optional[str] = None
+    
+    @classmethod
+    def from_search_hit(cls, result: Dict[str, Any]) -> "RawSearchResult":
+        """
+        Build a row from a SearchService.search_candidates result dict.
+        
+        Args:
+            result: Ranked search result with candidate info and metadata
+            
+        Returns:
+            Result row
+        """
+        metadata = result.get("metadata") or {}
+        skills = metadata.get("skills")
+        return cls(
+            candidate_id=result["candidate_id"],
+            similarity_score=result["similarity_score"],
+            first_name=result.get("first_name"),
+            last_name=result.get("last_name"),
+            email=result.get("email"),
+            matched_skills=tuple(skills) if skills is not None else None,
+            experience_level=metadata.get("experience_level")
+        )
+    
+    def to_search_result(self) -> SearchResult:
+        """Validate the row into the SearchResult API model."""
+        return SearchResult.model_validate(asdict(self))
+
+
+# Fields written per result by the JSON export, in SearchResult order
+EXPORT_RESULT_FIELDS = tuple(SearchResult.model_fields)
+
+
+@dataclass
+class DailySearchStats:
+    """Running totals for the searches made on one UTC day."""
+    searches: int = 0
+    successful_searches: int = 0
+    total_results: int = 0
+    total_search_time_ms: float = 0.0
+    hour_counts: np.ndarray = field(default_factory=lambda: np.zeros(24, dtype=np.int64))
+    
+    def add(self, search_time_ms: float, results_count: int, hour: int, sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) one search from the totals."""
+        self.searches += sign
+        self.successful_searches += sign * (results_count > 0)
+        self.total_results += sign * results_count
+        self.total_search_time_ms += sign * search_time_ms
+        self.hour_counts[hour] += sign
+    
+    def merge(self, other: "DailySearchStats"):
+        """Accumulate another bucket's totals into this one."""
+        self.searches += other.searches
+        self.successful_searches += other.successful_searches
+        self.total_results += other.total_results
+        self.total_search_time_ms += other.total_search_time_ms
+        self.hour_counts += other.hour_counts
+
+
+class SearchHistory:
+    """Column-oriented log of recent search executions for analytics."""
+    
+    _COLUMNS = ("executed_at", "search_time_ms", "results_count", "cache_hit", "recruiter_code")
+    
+    def __init__(self, max_entries: int = SEARCH_HISTORY_MAX_ENTRIES, initial_capacity: int = 1024):
+        """
+        Initialize search history.
+        
+        Args:
+            max_entries: Number of most recent searches kept
+            initial_capacity: Number of rows allocated up front
+        """
+        self.max_entries = max_entries
+        self._size = 0
+        self.executed_at = np.empty(initial_capacity, dtype=np.float64)  # POSIX timestamps
+        self.search_time_ms = np.empty(initial_capacity, dtype=np.float32)
+        self.results_count = np.empty(initial_capacity, dtype=np.int32)
+        self.cache_hit = np.empty(initial_capacity, dtype=np.bool_)
+        self.recruiter_code = np.empty(initial_capacity, dtype=np.int32)
+        self.keywords: List[List[str]] = []
+        # Recruiter IDs are stored as small integer codes so they can be compared in bulk
+        self._recruiter_codes: Dict[Optional[str], int] = {}
+        # Running keyword counts over retained entries, overall and per recruiter code
+        self._keyword_counts: Counter = Counter()
+        self._recruiter_keyword_counts: Dict[int, Counter] = {}
+        self._recruiter_entries: Counter = Counter()
+        # Per-day totals over retained entries, overall and per recruiter code
+        self._daily: Dict[int, DailySearchStats] = {}
+        self._recruiter_daily: Dict[int, Dict[int, DailySearchStats]] = {}
+    
+    def __len__(self) -> int:
+        return min(self._size, self.max_entries)
+    
+    def append(
+        self,
+        executed_at: float,
+        search_time_ms: float,
+        results_count: int,
+        cache_hit: bool,
+        recruiter_id: Optional[str],
+        keywords: List[str]
+    ):
+        """
+        Record one search execution.
+        
+        Args:
+            executed_at: POSIX timestamp of the search
+            search_time_ms: Search execution time
+            results_count: Number of results returned
+            cache_hit: Whether this was a cache hit
+            recruiter_id: ID of the recruiter who performed the search
+            keywords: Keywords extracted from the search requirements
+        """
+        if self._size == len(self.executed_at):
+            self._make_room()
+        
+        i = self._size
+        self.executed_at[i] = executed_at
+        self.search_time_ms[i] = search_time_ms
+        self.results_count[i] = results_count
+        self.cache_hit[i] = cache_hit
+        code = self._recruiter_codes.setdefault(recruiter_id, len(self._recruiter_codes))
+        self.recruiter_code[i] = code
+        self.keywords.append(keywords)
+        self._keyword_counts.update(keywords)
+        self._recruiter_keyword_counts.setdefault(code, Counter()).update(keywords)
+        self._recruiter_entries[code] += 1
+        # Use the stored float32 time so evicting this entry later subtracts exactly what was added
+        self._update_daily(code, executed_at, float(self.search_time_ms[i]), results_count, 1)
+        self._size += 1
+        
+        # Keep the running counts in step with the retained window
+        if self._size > self.max_entries:
+            evicted = self._size - self.max_entries - 1
+            evicted_code = int(self.recruiter_code[evicted])
+            for counts in (self._keyword_counts, self._recruiter_keyword_counts[evicted_code]):
+                for keyword in self.keywords[evicted]:
+                    counts[keyword] -= 1
+                    if counts[keyword] <= 0:
+                        del counts[keyword]
+            self._recruiter_entries[evicted_code] -= 1
+            self._update_daily(
+                evicted_code,
+                float(self.executed_at[evicted]),
+                float(self.search_time_ms[evicted]),
+                int(self.results_count[evicted]),
+                -1
+            )
+    
+    def _update_daily(
+        self,
+        code: int,
+        executed_at: float,
+        search_time_ms: float,
+        results_count: int,
+        sign: int
+    ):
+        """Add or remove one search in the overall and per-recruiter day buckets."""
+        day, seconds_into_day = divmod(int(executed_at), SECONDS_PER_DAY)
+        hour = seconds_into_day // 3600
+        for buckets in (self._daily, self._recruiter_daily.setdefault(code, {})):
+            stats = buckets.get(day)
+            if stats is None:
+                stats = buckets[day] = DailySearchStats()
+            stats.add(search_time_ms, results_count, hour, sign)
+            if stats.searches == 0:
+                del buckets[day]
+    
+    def _make_room(self):
+        """Grow the columns, or drop entries beyond max_entries once grown to twice that."""
+        capacity = len(self.executed_at)
+        if capacity >= 2 * self.max_entries:
+            # Compact to the newest max_entries rows; amortized O(1) per append
+            start = self._size - self.max_entries
+            for name in self._COLUMNS:
+                column = getattr(self, name)
+                column[:self.max_entries] = column[start:self._size]
+            del self.keywords[:start]
+            self._size = self.max_entries
+            return
+        
+        new_capacity = min(2 * capacity, 2 * self.max_entries)
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty(new_capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+    
+    def select(self, since: float, recruiter_id: Optional[str] = None) -> np.ndarray:
+        """
+        Find retained entries executed at or after a time.
+        
+        Args:
+            since: POSIX timestamp lower bound
+            recruiter_id: Recruiter ID to filter by (None for all recruiters)
+            
+        Returns:
+            Indices of matching entries, oldest first
+        """
+        start = self._size - len(self)
+        mask = self.executed_at[start:self._size] >= since
+        if recruiter_id is not None:
+            code = self._recruiter_codes.get(recruiter_id)
+            if code is None:
+                return np.empty(0, dtype=np.intp)
+            mask &= self.recruiter_code[start:self._size] == code
+        return np.flatnonzero(mask) + start
+    
+    def summarize(self, since_day: int, until_day: int, recruiter_id: Optional[str] = None) -> DailySearchStats:
+        """
+        Total the retained searches made on a range of UTC days.
+        
+        Args:
+            since_day: First day (days since the epoch) to include
+            until_day: Last day (days since the epoch) to include
+            recruiter_id: Recruiter ID to filter by (None for all recruiters)
+            
+        Returns:
+            Combined totals for the days in range
+        """
+        summary = DailySearchStats()
+        if recruiter_id is None:
+            buckets = self._daily
+        else:
+            code = self._recruiter_codes.get(recruiter_id)
+            buckets = self._recruiter_daily.get(code, {}) if code is not None else {}
+        
+        # Walk whichever is smaller: the day range or the populated days
+        if until_day - since_day + 1 <= len(buckets):
+            days = (day for day in range(since_day, until_day + 1) if day in buckets)
+        else:
+            days = (day for day in buckets if since_day <= day <= until_day)
+        for day in days:
+            summary.merge(buckets[day])
+        return summary
+    
+    def keyword_counts(self, since: float, searches: int, recruiter_id: Optional[str] = None) -> Counter:
+        """
+        Count keywords across retained entries executed at or after a time.
+        
+        Args:
+            since: POSIX timestamp lower bound
+            searches: Number of entries in that window (from summarize())
+            recruiter_id: Recruiter ID to filter by (None for all recruiters)
+            
+        Returns:
+            Keyword counts
+        """
+        # When the window covers every retained entry in scope, the running
+        # counts already hold the answer
+        if recruiter_id is None:
+            if searches == len(self):
+                return self._keyword_counts
+        else:
+            code = self._recruiter_codes.get(recruiter_id)
+            if code is not None and searches == self._recruiter_entries[code]:
+                return self._recruiter_keyword_counts[code]
+        
+        selected = self.select(since, recruiter_id)
+        return Counter(keyword for i in selected.tolist() for keyword in self.keywords[i])
+
+
 class AdvancedSearchService:
     """Service for advanced search features including caching, analytics, and export."""
     
     def __init__(self):
         """Initialize the advanced search service."""
         self.cache = SearchCache()
-        self.search_history: List[Dict[str, Any]] = []
+        self.search_history = SearchHistory()
         self.performance_metrics = {
             "total_searches": 0,
             "cache_hits": 0,
@@ -166,23 +445,14 @@ class AdvancedSearchService:
         self.performance_metrics["total_response_time_ms"] += search_time_ms
         
         # Record in search history
-        history_entry = {
-            "recruiter_id": recruiter_id,
-            "requirements": search_request.requirements,
-            "filters": search_request.filters,
-            "limit": search_request.limit,
-            "results_count": len(results.results),
-            "search_time_ms": search_time_ms,
-            "cache_hit": cache_hit,
-            "executed_at": datetime.utcnow(),
-            "keywords": self._extract_keywords(search_request.requirements)
-        }
-        
-        self.search_history.append(history_entry)
-        
-        # Keep only last 10000 entries to prevent memory issues
-        if len(self.search_history) > 10000:
-            self.search_history = self.search_history[-10000:]
+        self.search_history.append(
+            executed_at=time.time(),
+            search_time_ms=search_time_ms,
+            results_count=len(results.results),
+            cache_hit=cache_hit,
+            recruiter_id=recruiter_id,
+            keywords=self._extract_keywords(search_request.requirements)
+        )
         
         logger.info(f"Recorded search execution: {len(results.results)} results in {search_time_ms:.2f}ms")
     
@@ -196,22 +466,15 @@ class AdvancedSearchService:
         Returns:
             List of extracted keywords
         """
-        # Simple keyword extraction - split on whitespace and filter
-        words = requirements_text.lower().split()
-        
-        # Filter out common stop words and short words
-        stop_words = {
-            "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with",
-            "by", "is", "are", "was", "were", "be", "been", "have", "has", "had", "do", "does",
-            "did", "will", "would", "could", "should", "may", "might", "must", "can", "shall"
-        }
-        
-        keywords = [
-            word.strip(".,!?;:()[]{}\"'") for word in words
-            if len(word) > 2 and word.lower() not in stop_words
-        ]
+        # Simple keyword extraction - split on whitespace and filter out
+        # common stop words and short words
+        keywords = (
+            word.strip(KEYWORD_STRIP_CHARS)
+            for word in requirements_text.lower().split()
+            if len(word) > 2 and word not in KEYWORD_STOP_WORDS
+        )
         
-        return keywords[:10]  # Return top 10 keywords
+        return list(islice(keywords, MAX_KEYWORDS))
     
     def get_search_analytics(
         self,
@@ -228,16 +491,14 @@ class AdvancedSearchService:
         Returns:
             Search analytics
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+        # Whole UTC days, from midnight days_back days ago through today
+        today = int(time.time()) // SECONDS_PER_DAY
+        since_day = today - days_back
         
-        # Filter search history
-        filtered_history = [
-            entry for entry in self.search_history
-            if entry["executed_at"] >= cutoff_date and
-            (recruiter_id is None or entry.get("recruiter_id") == recruiter_id)
-        ]
+        history = self.search_history
+        summary = history.summarize(since_day, today, recruiter_id)
         
-        if not filtered_history:
+        if not summary.searches:
             return SearchAnalytics(
                 total_searches=0,
                 average_results_per_search=0.0,
@@ -249,31 +510,25 @@ class AdvancedSearchService:
             )
         
         # Calculate analytics
-        total_searches = len(filtered_history)
-        total_results = sum(entry["results_count"] for entry in filtered_history)
-        successful_searches = sum(1 for entry in filtered_history if entry["results_count"] > 0)
-        total_search_time = sum(entry["search_time_ms"] for entry in filtered_history)
-        
-        # Extract all keywords
-        all_keywords = []
-        for entry in filtered_history:
-            all_keywords.extend(entry.get("keywords", []))
+        total_searches = summary.searches
         
         # Get most common keywords
-        keyword_counts = Counter(all_keywords)
+        keyword_counts = history.keyword_counts(
+            since_day * SECONDS_PER_DAY, total_searches, recruiter_id
+        )
         most_common_keywords = [keyword for keyword, _ in keyword_counts.most_common(10)]
         
-        # Calculate peak search hours
-        search_hours = [entry["executed_at"].hour for entry in filtered_history]
-        hour_counts = Counter(search_hours)
-        peak_search_hours = [hour for hour, _ in hour_counts.most_common(5)]
+        # Calculate peak search hours (UTC)
+        hour_counts = summary.hour_counts
+        busiest_hours = np.argsort(-hour_counts, kind="stable")[:5]
+        peak_search_hours = [int(hour) for hour in busiest_hours if hour_counts[hour] > 0]
         
         return SearchAnalytics(
             total_searches=total_searches,
-            average_results_per_search=total_results / total_searches if total_searches > 0 else 0.0,
+            average_results_per_search=summary.total_results / total_searches,
             most_common_keywords=most_common_keywords,
-            search_success_rate=successful_searches / total_searches if total_searches > 0 else 0.0,
-            average_search_time_ms=total_search_time / total_searches if total_searches > 0 else 0.0,
+            search_success_rate=summary.successful_searches / total_searches,
+            average_search_time_ms=summary.total_search_time_ms / total_searches,
             peak_search_hours=peak_search_hours,
             top_saved_searches=[]  # Would need saved search usage data
         )
@@ -314,22 +569,60 @@ class AdvancedSearchService:
         Returns:
             Export response with download information
         """
+        return self._export_results(results.results, results, export_request, recruiter_id)
+    
+    def export_raw_results(
+        self,
+        rows: List[RawSearchResult],
+        query_processed: str,
+        export_request: SearchExportRequest,
+        recruiter_id: str,
+        search_time_ms: Optional[float] = None
+    ) -> SearchExportResponse:
+        """
+        Export internal result rows without validating each one as a SearchResult.
+        
+        Args:
+            rows: Result rows to export
+            query_processed: Processed search query
+            export_request: Export configuration
+            recruiter_id: ID of the recruiter requesting export
+            search_time_ms: Search execution time in milliseconds
+            
+        Returns:
+            Export response with download information
+        """
+        summary = SearchResponse(
+            results=[],
+            total_results=len(rows),
+            query_processed=query_processed,
+            search_time_ms=search_time_ms
+        )
+        return self._export_results(rows, summary, export_request, recruiter_id)
+    
+    def _export_results(
+        self,
+        export_results: List[Any],
+        search_response: SearchResponse,
+        export_request: SearchExportRequest,
+        recruiter_id: str
+    ) -> SearchExportResponse:
+        """Export SearchResult or RawSearchResult rows; search_response supplies metadata."""
         export_id = str(uuid.uuid4())
         
         # Limit results if requested
-        export_results = results.results
         if export_request.max_results and len(export_results) > export_request.max_results:
             export_results = export_results[:export_request.max_results]
         
         # Generate export content based on format
         if export_request.format == ExportFormat.CSV:
-            content = self._export_to_csv(export_results, results, export_request.include_metadata)
+            content = self._export_to_csv(export_results, search_response, export_request.include_metadata)
             filename = f"search_results_{export_id}.csv"
         elif export_request.format == ExportFormat.JSON:
-            content = self._export_to_json(export_results, results, export_request.include_metadata)
+            content = self._export_to_json(export_results, search_response, export_request.include_metadata)
             filename = f"search_results_{export_id}.json"
         elif export_request.format == ExportFormat.PDF:
-            content = self._export_to_pdf(export_results, results, export_request.include_metadata)
+            content = self._export_to_pdf(export_results, search_response, export_request.include_metadata)
             filename = f"search_results_{export_id}.pdf"
         else:
             raise ValueError(f"Unsupported export format: {export_request.format}")
@@ -365,21 +658,30 @@ class AdvancedSearchService:
             headers.extend(["Search Query", "Total Results", "Search Time (ms)"])
         writer.writerow(headers)
         
+        # Metadata columns are identical on every row, so build them once
+        metadata_columns: Tuple[Any, ...] = ()
+        if include_metadata:
+            metadata_columns = (
+                search_response.query_processed,
+                search_response.total_results,
+                search_response.search_time_ms or 0
+            )
+        
         # Write data rows
-        for result in results:
-            row = [
-                result.candidate_id,
-                f"{result.similarity_score:.3f}",
-                ", ".join(result.matched_skills or []),
-                result.experience_level or "N/A"
-            ]
-            if include_metadata:
-                row.extend([
-                    search_response.query_processed,
-                    search_response.total_results,
-                    search_response.search_time_ms or 0
-                ])
-            writer.writerow(row)
+        get_fields = attrgetter(
+            "candidate_id", "similarity_score", "matched_skills", "experience_level"
+        )
+        writer.writerows(
+            (
+                candidate_id,
+                f"{similarity_score:.3f}",
+                ", ".join(matched_skills or ()),
+                experience_level or "N/A",
+                *metadata_columns
+            )
+            for candidate_id, similarity_score, matched_skills, experience_level
+            in map(get_fields, results)
+        )
         
         return output.getvalue()
     
@@ -390,8 +692,9 @@ class AdvancedSearchService:
         include_metadata: bool
     ) -> str:
         """Export results to JSON format."""
+        get_fields = attrgetter(*EXPORT_RESULT_FIELDS)
         export_data = {
-            "results": [result.dict() for result in results],
+            "results": [dict(zip(EXPORT_RESULT_FIELDS, get_fields(result))) for result in results],
             "total_exported": len(results)
         }
         
@@ -403,7 +706,7 @@ class AdvancedSearchService:
                 "exported_at": datetime.utcnow().isoformat()
             }
         
-        return json.dumps(export_data, indent=2)
+        return orjson.dumps(export_data, option=orjson.OPT_INDENT_2).decode()
     
     def _export_to_pdf(
         self,
@@ -1,8 +1,11 @@
 """Audit logging and monitoring service for SecureHR application."""
 
-import json
+import atexit
 import logging
+import random
+import threading
 import time
+from collections import deque
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional
@@ -11,21 +14,235 @@ from fastapi import Request
 import hashlib
 import os
 
+import orjson
+
 from app.config import get_settings
 
 settings = get_settings()
 
-# Configure audit logger
-audit_logger = logging.getLogger("securehr.audit")
-audit_logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Number of audit write buffers cycled between request threads and the writer
+AUDIT_BUFFER_COUNT = 4
+
+# Fill level in bytes at which a buffer is handed to the writer thread
+AUDIT_BUFFER_FLUSH_BYTES = 60 * 1024
+
+# Longest time in seconds a partially filled buffer waits before being written
+AUDIT_FLUSH_INTERVAL_SECONDS = 0.2
+
+
+# Most buffers submitted to the kernel in one vectored write
+AUDIT_WRITE_BATCH_BUFFERS = 32
+
+
+def _write_buffers(fd: int, buffers: List[bytearray]) -> None:
+    """
+    Write buffers to a file descriptor in order, retrying partial writes.
+    
+    Uses a single writev call per batch where the platform provides it, and
+    one write per buffer otherwise.
+    
+    Args:
+        fd: Open file descriptor
+        buffers: Buffers to write
+    """
+    if not hasattr(os, "writev"):
+        for buffer in buffers:
+            offset = os.write(fd, buffer)
+            while offset < len(buffer):
+                offset += os.write(fd, bytes(buffer[offset:]))
+        return
+    
+    pending = [buffer for buffer in buffers if buffer]
+    while pending:
+        written = os.writev(fd, pending)
+        while pending and written >= len(pending[0]):
+            written -= len(pending.pop(0))
+        if pending and written:
+            pending[0] = bytes(pending[0][written:])
+
+
+class BufferPool:
+    """
+    Fixed set of write buffers cycling through empty, filling, full and flushing.
+    
+    Request threads append serialized lines to the single filling buffer. Once
+    it reaches the flush threshold it is queued as full and the next empty
+    buffer takes its place; the writer thread takes the full buffers, writes
+    them with one vectored syscall and returns them to the empty set. If every
+    buffer is queued, appends fill a temporary buffer instead of waiting for
+    the writer, so callers on the event loop never block.
+    """
+    
+    def __init__(
+        self,
+        count: int = AUDIT_BUFFER_COUNT,
+        flush_threshold: int = AUDIT_BUFFER_FLUSH_BYTES
+    ):
+        self.count = count
+        self.flush_threshold = flush_threshold
+        self.condition = threading.Condition()
+        self._empty = deque(bytearray() for _ in range(count - 1))
+        self._filling = bytearray()
+        self._full: deque = deque()
+    
+    def append(self, line: bytes) -> None:
+        """
+        Append one line to the filling buffer, rotating it when full.
+        
+        Args:
+            line: Serialized event without a trailing newline
+        """
+        with self.condition:
+            self._filling += line
+            self._filling += b"\n"
+            if len(self._filling) < self.flush_threshold:
+                return
+            
+            self._full.append(self._filling)
+            self.condition.notify_all()
+            # Never wait here: appends run on the event loop. With every pooled
+            # buffer queued, fill a temporary one that release() later drops
+            self._filling = self._empty.popleft() if self._empty else bytearray()
+    
+    def wait_for_full(self, timeout: float) -> bool:
+        """
+        Block until a buffer is full or the timeout elapses.
+        
+        Args:
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            True if a full buffer is waiting to be written
+        """
+        with self.condition:
+            if not self._full:
+                self.condition.wait(timeout)
+            return bool(self._full)
+    
+    def take(self, include_filling: bool) -> List[bytearray]:
+        """
+        Take every full buffer for flushing, oldest first.
+        
+        Args:
+            include_filling: Also take the contents of the partially filled buffer
+            
+        Returns:
+            Buffers to write; return each with release() once written
+        """
+        with self.condition:
+            buffers = list(self._full)
+            self._full.clear()
+            if include_filling and self._filling:
+                # Copy out rather than rotate so a timed flush never waits for an empty buffer
+                buffers.append(bytearray(self._filling))
+                self._filling.clear()
+            return buffers
+    
+    def release(self, buffer: bytearray) -> None:
+        """Return a written buffer to the empty set."""
+        buffer.clear()
+        with self.condition:
+            # Temporary copies and fallback buffers are dropped once the pool is whole
+            if len(self._empty) + len(self._full) + 1 < self.count:
+                self._empty.append(buffer)
+            self.condition.notify_all()
+    
+    def notify(self) -> None:
+        """Wake the writer thread."""
+        with self.condition:
+            self.condition.notify_all()
 
-# Create audit log handler
-audit_handler = logging.FileHandler("audit.log")
-audit_formatter = logging.Formatter(
-    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-audit_handler.setFormatter(audit_formatter)
-audit_logger.addHandler(audit_handler)
+
+class AsyncJsonLogger:
+    """
+    Append-only JSON Lines logger drained by a background writer thread.
+    
+    Callers serialize the event with orjson and append it to a BufferPool
+    buffer, so request threads never wait on file I/O. A daemon thread writes
+    the full buffers together with one writev call, and writes whatever is
+    pending at least every AUDIT_FLUSH_INTERVAL_SECONDS.
+    """
+    
+    def __init__(self, path: str, buffers: Optional[BufferPool] = None):
+        self.path = path
+        self._buffers = buffers or BufferPool()
+        self._write_lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+    
+    def log(self, event: Dict[str, Any]) -> None:
+        """
+        Queue an event for writing.
+        
+        Args:
+            event: JSON-serializable event; unknown types are written via str()
+        """
+        self._enqueue(orjson.dumps(event, default=str, option=orjson.OPT_UTC_Z))
+    
+    def _enqueue(self, line: bytes) -> None:
+        """Append one serialized line to the current write buffer."""
+        if self._writer is None:
+            self._start_writer()
+        self._buffers.append(line)
+    
+    def _start_writer(self) -> None:
+        """Start the writer thread on first use."""
+        with self._write_lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(
+                target=self._run, name="audit-log-writer", daemon=True
+            )
+            self._writer.start()
+    
+    def _run(self) -> None:
+        """Writer thread loop: write full buffers, or all pending lines on timeout."""
+        while not self._closed:
+            has_full = self._buffers.wait_for_full(AUDIT_FLUSH_INTERVAL_SECONDS)
+            try:
+                self._write_pending(include_filling=not has_full)
+            except OSError as e:
+                logger.error(f"Failed to write audit log {self.path}: {e}")
+    
+    def _write_pending(self, include_filling: bool) -> None:
+        """Write taken buffers in order, batching them into vectored writes."""
+        with self._write_lock:
+            buffers = self._buffers.take(include_filling)
+            try:
+                if buffers:
+                    if self._fd is None:
+                        self._fd = os.open(
+                            self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o640
+                        )
+                    for start in range(0, len(buffers), AUDIT_WRITE_BATCH_BUFFERS):
+                        _write_buffers(self._fd, buffers[start:start + AUDIT_WRITE_BATCH_BUFFERS])
+            finally:
+                for buffer in buffers:
+                    self._buffers.release(buffer)
+    
+    def flush(self) -> None:
+        """Write every pending event to the log file."""
+        self._write_pending(include_filling=True)
+    
+    def close(self) -> None:
+        """Stop the writer thread, flush remaining events, and close the file."""
+        self._closed = True
+        self._buffers.notify()
+        if self._writer is not None:
+            self._writer.join(timeout=AUDIT_FLUSH_INTERVAL_SECONDS * 5)
+        self.flush()
+        with self._write_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+# Configure audit logger
+audit_logger = AsyncJsonLogger("audit.log")
+atexit.register(audit_logger.close)
 
 # Security event logger
 security_logger = logging.getLogger("securehr.security")
@@ -76,6 +293,11 @@ class SecurityEventType(str, Enum):
     PATH_TRAVERSAL_ATTEMPT = "path_traversal_attempt"
 
 
+# Routine, high-volume event types logged at settings.audit_sample_rate;
+# every other type (authentication, CV uploads, deletions, security) is always logged
+SAMPLED_AUDIT_EVENT_TYPES = frozenset({AuditEventType.DATA_ACCESS})
+
+
 @dataclass
 class AuditEvent:
     """Audit event data structure."""
@@ -119,6 +341,7 @@ class AuditService:
     def __init__(self):
         self.settings = get_settings()
         self._event_counter = 0
+        self._audit_logger = audit_logger
     
     def _generate_event_id(self) -> str:
         """Generate unique event ID."""
@@ -159,7 +382,11 @@ class AuditService:
         session_id: Optional[str] = None,
         request_id: Optional[str] = None
     ):
-        """Log an audit event."""
+        """Log an audit event; sampled event types are dropped at random per settings."""
+        if (event_type in SAMPLED_AUDIT_EVENT_TYPES
+                and random.random() >= self.settings.audit_sample_rate):
+            return
+        
         client_ip, user_agent = self._get_client_info(request)
         
         event = AuditEvent(
@@ -181,7 +408,7 @@ class AuditService:
         )
         
         # Log to audit log
-        audit_logger.info(json.dumps(asdict(event), default=str))
+        self._audit_logger.log(asdict(event))
         
         # Also log to console in debug mode
         if self.settings.debug:
@@ -216,7 +443,9 @@ class AuditService:
         )
         
         # Log to security log
-        security_logger.warning(json.dumps(asdict(event), default=str))
+        security_logger.warning(
+            orjson.dumps(asdict(event), default=str, option=orjson.OPT_UTC_Z).decode()
+        )
         
         # Also log to console
         print(f"SECURITY: {event_type} - Severity: {severity} - IP: {client_ip} - Blocked: {blocked}")
@@ -232,12 +461,16 @@ class AuditService:
         alert_message = (
             f"SECURITY ALERT: {event.event_type} detected from {event.ip_address} "
             f"at {event.timestamp}. Severity: {event.severity}. "
-            f"Details: {json.dumps(event.details)}"
+            f"Details: {orjson.dumps(event.details, default=str).decode()}"
         )
         
         # Log to both security and audit logs
         security_logger.critical(alert_message)
-        audit_logger.critical(alert_message)
+        self._audit_logger.log({
+            "event_id": event.event_id,
+            "timestamp": event.timestamp,
+            "alert": alert_message
+        })
         
         # Print to console for immediate visibility
         print(f"🚨 {alert_message}")
@@ -316,8 +549,9 @@ class AuditService:
         details: Optional[Dict[str, Any]] = None
     ):
         """Log search activity."""
-        # Hash the search query for privacy
-        query_hash = hashlib.sha256(search_query.encode()).hexdigest()[:16]
+        # Fingerprint the search query for privacy; this only groups identical
+        # queries, so a 64-bit BLAKE2b digest replaces truncated SHA-256
+        query_hash = hashlib.blake2b(search_query.encode(), digest_size=8).hexdigest()
         
         event_details = {
             "query_hash": query_hash,
@@ -1,26 +1,37 @@
 """CV processing service for SecureHR application."""
 
+import asyncio
 import hashlib
 import io
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import BinaryIO, Optional, Tuple
 from datetime import datetime
 
-import PyPDF2
+import fitz  # PyMuPDF
 from docx import Document
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..models.database import CVVectorDB
-from .cyborgdb_service import CyborgDBService
+from .cyborgdb_service import CyborgDBService, StoreBatch
 
 logger = logging.getLogger(__name__)
 
 # File size limit: 10MB
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
+# Chunk size used when streaming uploads through the hasher: 1MB
+READ_CHUNK_SIZE = 1024 * 1024
+
+# SHA256 file hashes are kept as raw digests (32 bytes) rather than 64-char hex
+HASH_BYTES = 32
+
+# Maximum number of extracted CV texts kept in the file-hash cache
+TEXT_CACHE_MAX_ENTRIES = 256
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {".pdf", ".doc", ".docx"}
 
@@ -32,9 +43,30 @@ ALLOWED_MIME_TYPES = {
 }
 
 
+def _hash_and_read(file_obj: BinaryIO) -> Tuple[bytes, bytes]:
+    """
+    Read a file object in chunks, hashing each chunk as it is read.
+    
+    Args:
+        file_obj: Underlying (synchronous) file object of an upload
+        
+    Returns:
+        Tuple of (sha256_digest, file_content)
+    """
+    hasher = hashlib.sha256()
+    chunks = []
+    for chunk in iter(lambda: file_obj.read(READ_CHUNK_SIZE), b""):
+        hasher.update(chunk)
+        chunks.append(chunk)
+    return hasher.digest(), b"".join(chunks)
+
+
 class CVProcessorService:
     """Service for handling CV file uploads and text extraction."""
 
+    # Extracted text keyed by (file SHA256, extension), shared across instances (LRU order)
+    _text_cache: "OrderedDict[Tuple[bytes, str], str]" = OrderedDict()
+
     def __init__(self):
         """Initialize CV processor with CyborgDB service."""
         self.cyborgdb_service = CyborgDBService()
@@ -88,24 +120,22 @@ class CVProcessorService:
             HTTPException: If PDF processing fails
         """
         try:
-            pdf_file = io.BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            if len(pdf_reader.pages) == 0:
-                raise HTTPException(
-                    status_code=400,
-                    detail="PDF file appears to be empty or corrupted"
-                )
-            
-            text_content = []
-            for page in pdf_reader.pages:
-                try:
-                    page_text = page.extract_text()
-                    if page_text.strip():
-                        text_content.append(page_text)
-                except Exception as e:
-                    logger.warning(f"Failed to extract text from PDF page: {e}")
-                    continue
+            with fitz.open(stream=file_content, filetype="pdf") as pdf_doc:
+                if pdf_doc.page_count == 0:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="PDF file appears to be empty or corrupted"
+                    )
+                
+                text_content = []
+                for page in pdf_doc:
+                    try:
+                        page_text = page.get_text("text")
+                        if page_text.strip():
+                            text_content.append(page_text)
+                    except Exception as e:
+                        logger.warning(f"Failed to extract text from PDF page: {e}")
+                        continue
             
             extracted_text = "\n".join(text_content).strip()
             
@@ -144,17 +174,21 @@ class CVProcessorService:
             docx_file = io.BytesIO(file_content)
             doc = Document(docx_file)
             
+            # Collect fragments and join once; paragraph/cell .text is rebuilt
+            # from runs on every access, so read it a single time
             text_content = []
             for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_content.append(paragraph.text)
+                paragraph_text = paragraph.text
+                if paragraph_text.strip():
+                    text_content.append(paragraph_text)
             
             # Also extract text from tables
             for table in doc.tables:
                 for row in table.rows:
                     for cell in row.cells:
-                        if cell.text.strip():
-                            text_content.append(cell.text)
+                        cell_text = cell.text
+                        if cell_text.strip():
+                            text_content.append(cell_text)
             
             extracted_text = "\n".join(text_content).strip()
             
@@ -200,7 +234,7 @@ class CVProcessorService:
         )
 
     @classmethod
-    async def extract_text(cls, file: UploadFile) -> Tuple[str, str]:
+    async def extract_text(cls, file: UploadFile) -> Tuple[str, bytes]:
         """
         Extract text content from uploaded CV file.
         
@@ -208,7 +242,7 @@ class CVProcessorService:
             file: The uploaded file
             
         Returns:
-            Tuple of (extracted_text, file_hash)
+            Tuple of (extracted_text, file_hash) where file_hash is the raw SHA256 digest
             
         Raises:
             HTTPException: If file processing fails
@@ -216,18 +250,24 @@ class CVProcessorService:
         # Validate file first
         cls.validate_file(file)
         
-        # Read file content
-        file_content = await file.read()
-        
-        # Calculate file hash for integrity checking
-        file_hash = hashlib.sha256(file_content).hexdigest()
+        # Read and hash the underlying spooled file off the event loop
+        file_hash, file_content = await asyncio.to_thread(_hash_and_read, file.file)
         
         # Reset file position for potential re-reading
         await file.seek(0)
         
-        # Extract text based on file type
         file_ext = Path(file.filename or "").suffix.lower()
         
+        # Identical uploads of the same file type skip parsing entirely; the
+        # extension is part of the key so a rename still goes through its parser
+        cache_key = (file_hash, file_ext)
+        cached_text = cls._text_cache.get(cache_key)
+        if cached_text is not None:
+            cls._text_cache.move_to_end(cache_key)
+            logger.info(f"Using cached text extraction for file hash {file_hash.hex()}")
+            return cached_text, file_hash
+        
+        # Extract text based on file type
         if file_ext == ".pdf":
             extracted_text = await cls.extract_text_from_pdf(file_content)
         elif file_ext == ".docx":
@@ -247,13 +287,18 @@ class CVProcessorService:
                 detail="Extracted text is too short. Please ensure your CV contains sufficient content."
             )
         
+        cls._text_cache[cache_key] = extracted_text
+        if len(cls._text_cache) > TEXT_CACHE_MAX_ENTRIES:
+            cls._text_cache.popitem(last=False)
+        
         return extracted_text, file_hash
 
     async def process_cv_complete(
         self, 
         file: UploadFile, 
         candidate_id: str,
-        db: Session
+        db: Session,
+        store_batch: Optional[StoreBatch] = None
     ) -> str:
         """
         Complete CV processing pipeline: extract text and store in CyborgDB.
@@ -262,6 +307,7 @@ class CVProcessorService:
             file: The uploaded CV file
             candidate_id: ID of the candidate
             db: Database session
+            store_batch: Optional batch context that coalesces concurrent stores
             
         Returns:
             CyborgDB item ID (same as candidate_id)
@@ -274,31 +320,31 @@ class CVProcessorService:
             extracted_text, file_hash = await self.extract_text(file)
             logger.info(f"Extracted {len(extracted_text)} characters from CV for candidate {candidate_id}")
             
-            # Step 2: Store CV text in CyborgDB (it will handle embedding generation automatically)
-            metadata = {
-                "original_filename": file.filename,
-                "file_hash": file_hash,
-                "text_length": len(extracted_text),
-                "processed_at": datetime.utcnow().isoformat()
-            }
-            
-            cyborgdb_item_id = await self.cyborgdb_service.store_vector(
-                cv_text=extracted_text,  # Store original text, CyborgDB handles embeddings
-                candidate_id=candidate_id,
-                metadata=metadata
-            )
-            
-            # Step 3: Store or update vector metadata in local database (1 user = 1 CV)
             existing_vector = db.query(CVVectorDB).filter(
                 CVVectorDB.candidate_id == candidate_id
             ).first()
             
+            # Reuse the stored vector if it was built from this exact file
+            reuse_stored_vector = bool(
+                existing_vector
+                and existing_vector.file_hash == file_hash
+                and existing_vector.cyborgdb_vector_id
+            )
+            
+            # CyborgDB item IDs are the candidate ID, so the metadata row can be
+            # written before the store returns
+            cyborgdb_item_id = (
+                existing_vector.cyborgdb_vector_id if reuse_stored_vector else candidate_id
+            )
+            
+            # Step 2: Stage vector metadata in local database (1 user = 1 CV)
             if existing_vector:
                 # Update existing record
-                existing_vector.cyborgdb_vector_id = cyborgdb_item_id
-                existing_vector.vector_dimensions = "384"  # all-MiniLM-L6-v2 produces 384-dimensional vectors
-                existing_vector.original_filename = file.filename
-                existing_vector.file_hash = file_hash
+                vector_record = existing_vector
+                vector_record.cyborgdb_vector_id = cyborgdb_item_id
+                vector_record.vector_dimensions = "384"  # all-MiniLM-L6-v2 produces 384-dimensional vectors
+                vector_record.original_filename = file.filename
+                vector_record.file_hash = file_hash
             else:
                 # Create new record
                 vector_record = CVVectorDB(
@@ -310,6 +356,37 @@ class CVProcessorService:
                 )
                 db.add(vector_record)
             
+            # Step 3: Store CV text in CyborgDB (it will handle embedding generation automatically)
+            if reuse_stored_vector:
+                logger.info(f"CV for candidate {candidate_id} unchanged, skipping CyborgDB store")
+            else:
+                metadata = {
+                    "original_filename": file.filename,
+                    "file_hash": file_hash.hex(),
+                    "text_length": len(extracted_text),
+                    "processed_at": datetime.utcnow().isoformat()
+                }
+                
+                # Flush the metadata row while CyborgDB stores the CV; wait for both
+                # so a failed store never races the rollback below
+                store = store_batch or self.cyborgdb_service
+                store_result, flush_result = await asyncio.gather(
+                    store.store_vector(
+                        cv_text=extracted_text,  # Store original text, CyborgDB handles embeddings
+                        candidate_id=candidate_id,
+                        metadata=metadata
+                    ),
+                    asyncio.to_thread(db.flush),
+                    return_exceptions=True
+                )
+                for result in (store_result, flush_result):
+                    if isinstance(result, BaseException):
+                        raise result
+                
+                cyborgdb_item_id = store_result
+                vector_record.cyborgdb_vector_id = cyborgdb_item_id
+            
+            # Commit only once both the row and the CyborgDB item are written
             db.commit()
             
             logger.info(f"Successfully processed CV for candidate {candidate_id}, CyborgDB ID: {cyborgdb_item_id}")
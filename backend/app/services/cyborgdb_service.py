@@ -13,6 +13,9 @@ from ..config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Coalescing window for StoreBatch: upsert after 50ms or 32 queued CVs
+STORE_BATCH_WINDOW_SECONDS = 0.05
+STORE_BATCH_MAX_ITEMS = 32
 
 class CyborgDBService:
     """Service for managing encrypted vector storage and search in CyborgDB."""
@@ -131,6 +134,52 @@ class CyborgDBService:
         
         return self._index
     
+    @staticmethod
+    def _build_item(
+        cv_text: str,
+        candidate_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build a CyborgDB upsert item for a candidate's CV.
+        
+        Args:
+            cv_text: Original CV text content
+            candidate_id: ID of the candidate
+            metadata: Optional metadata to store with vector
+            
+        Returns:
+            Item dictionary ready for upsert
+        """
+        # Prepare metadata
+        vector_metadata = {
+            "candidate_id": candidate_id,
+            "type": "cv_vector",
+            **(metadata or {})
+        }
+        
+        # Prepare item for upsert - CyborgDB will generate embeddings automatically
+        return {
+            "id": candidate_id,  # Use candidate_id as the item ID
+            "contents": cv_text,  # CyborgDB will generate embeddings from this
+            "metadata": vector_metadata
+        }
+    
+    async def _upsert_items(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Upsert a list of items into CyborgDB with a single call.
+        
+        Args:
+            items: Items built by _build_item
+        """
+        index = await self._get_or_create_index()
+        
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(
+            self._executor,
+            lambda: index.upsert(items)
+        )
+    
     async def store_vector(
         self, 
         cv_text: str,  # Store the original CV text instead of encrypted vector
@@ -140,6 +189,9 @@ class CyborgDBService:
         """
         Store CV text in CyborgDB with automatic embedding generation.
         
+        Bulk imports should store through a StoreBatch instead, which
+        coalesces concurrent CVs into store_vectors calls.
+        
         Args:
             cv_text: Original CV text content
             candidate_id: ID of the candidate
@@ -152,36 +204,50 @@ class CyborgDBService:
             RuntimeError: If storage operation fails
         """
         try:
-            index = await self._get_or_create_index()
-            
-            # Prepare metadata
-            vector_metadata = {
-                "candidate_id": candidate_id,
-                "type": "cv_vector",
-                **(metadata or {})
-            }
-            
-            # Prepare item for upsert - CyborgDB will generate embeddings automatically
-            item = {
-                "id": candidate_id,  # Use candidate_id as the item ID
-                "contents": cv_text,  # CyborgDB will generate embeddings from this
-                "metadata": vector_metadata
-            }
-            
-            # Store in CyborgDB using upsert
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                self._executor,
-                lambda: index.upsert([item])
-            )
+            item = self._build_item(cv_text, candidate_id, metadata)
+            await self._upsert_items([item])
+            item_id = item["id"]
             
             logger.info(f"Stored CV text for candidate {candidate_id} in CyborgDB")
-            return candidate_id  # Return the item ID
+            return item_id
             
         except Exception as e:
             logger.error(f"Failed to store CV in CyborgDB: {e}")
             raise RuntimeError(f"CV storage failed: {str(e)}")
     
+    async def store_vectors(
+        self,
+        items: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> List[str]:
+        """
+        Store multiple CV texts in CyborgDB with a single upsert.
+        
+        Args:
+            items: List of (cv_text, candidate_id, metadata) tuples
+            
+        Returns:
+            Item IDs in CyborgDB, in input order
+            
+        Raises:
+            RuntimeError: If storage operation fails
+        """
+        if not items:
+            return []
+        
+        try:
+            upsert_items = [
+                self._build_item(cv_text, candidate_id, metadata)
+                for cv_text, candidate_id, metadata in items
+            ]
+            await self._upsert_items(upsert_items)
+            
+            logger.info(f"Stored {len(upsert_items)} CV texts in CyborgDB")
+            return [item["id"] for item in upsert_items]
+            
+        except Exception as e:
+            logger.error(f"Failed to store CVs in CyborgDB: {e}")
+            raise RuntimeError(f"CV storage failed: {str(e)}")
+    
     async def retrieve_vector(self, item_id: str) -> Tuple[str, Dict[str, Any]]:
         """
         Retrieve CV data from CyborgDB.
@@ -359,4 +425,107 @@ class CyborgDBService:
             
         except Exception as e:
             logger.error(f"CyborgDB health check failed: {e}")
-            return False
\ No newline at end of file
+            return False
+
+class StoreBatch:
+    """
+    Batch context that coalesces concurrent CV stores into store_vectors calls.
+    
+    Stores are queued on an asyncio.Queue and a drain task upserts them once
+    STORE_BATCH_MAX_ITEMS are waiting or STORE_BATCH_WINDOW_SECONDS after the
+    first one arrived. Open one around a bulk import and pass it to
+    CVProcessorService.process_cv_complete; single uploads store directly.
+    """
+    
+    def __init__(
+        self,
+        cyborgdb_service: CyborgDBService,
+        window_seconds: float = STORE_BATCH_WINDOW_SECONDS,
+        max_items: int = STORE_BATCH_MAX_ITEMS
+    ):
+        self.cyborgdb_service = cyborgdb_service
+        self.window_seconds = window_seconds
+        self.max_items = max_items
+        self._queue: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
+    
+    async def __aenter__(self) -> "StoreBatch":
+        self._queue = asyncio.Queue()
+        self._drain_task = asyncio.create_task(self._drain())
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        # The sentinel flushes whatever is still queued before the drain task exits
+        await self._queue.put(None)
+        await self._drain_task
+    
+    async def store_vector(
+        self,
+        cv_text: str,
+        candidate_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Queue a CV for the next batched upsert and wait for it to be stored.
+        
+        Args:
+            cv_text: Original CV text content
+            candidate_id: ID of the candidate
+            metadata: Optional metadata to store with vector
+            
+        Returns:
+            Item ID in CyborgDB
+            
+        Raises:
+            RuntimeError: If the batch containing this CV fails to store
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((cv_text, candidate_id, metadata), future))
+        return await future
+    
+    async def _drain(self) -> None:
+        """Collect queued stores into batches until the closing sentinel arrives."""
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            entry = await self._queue.get()
+            if entry is None:
+                return
+            
+            batch = [entry]
+            deadline = loop.time() + self.window_seconds
+            while len(batch) < self.max_items:
+                try:
+                    entry = await asyncio.wait_for(
+                        self._queue.get(), timeout=max(deadline - loop.time(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    closing = True
+                    break
+                batch.append(entry)
+            
+            await self._store_batch(batch)
+    
+    async def _store_batch(
+        self,
+        batch: List[Tuple[Tuple[str, str, Optional[Dict[str, Any]]], asyncio.Future]]
+    ) -> None:
+        """
+        Store a batch with one store_vectors call and resolve the waiting stores.
+        
+        Args:
+            batch: Queued ((cv_text, candidate_id, metadata), future) pairs
+        """
+        try:
+            item_ids = await self.cyborgdb_service.store_vectors([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), item_id in zip(batch, item_ids):
+            if not future.done():
+                future.set_result(item_id)
@@ -3,14 +3,33 @@
 import json
 import time
 import threading
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from itertools import islice
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
 from app.services.audit_service import audit_service, SecurityEventType
 
+# Most recent security events kept across all sources
+EVENT_HISTORY_MAX_EVENTS = 10_000
+
+# Most recent events kept per IP address and per user
+ACTIVITY_MAX_EVENTS_PER_KEY = 512
+
+# Most recent alerts kept for the security dashboard
+ALERT_HISTORY_MAX_ALERTS = 1_000
+
+# Age in seconds after which per-IP and per-user activity is discarded
+ACTIVITY_RETENTION_SECONDS = 86400
+
+# Seconds a computed security dashboard is served before being rebuilt
+DASHBOARD_CACHE_TTL_SECONDS = 2.0
+
+# Window in seconds over which the failed login thresholds apply
+FAILED_LOGIN_WINDOW_SECONDS = 3600
+
 
 class AlertLevel(str, Enum):
     """Alert severity levels."""
@@ -34,14 +53,32 @@ class SecurityAlert:
 
 
 class SecurityMonitor:
-    """Real-time security monitoring and alerting."""
+    """
+    Real-time security monitoring and alerting.
+    
+    Event history, per-IP and per-user activity, and alerts are fixed-size ring
+    buffers: like a flight recorder, the oldest entries are overwritten once a
+    buffer is full, so memory stays bounded under sustained attack traffic.
+    Alerts are kept in their own buffer and outlive the events that raised them.
+    """
     
     def __init__(self):
-        self.alerts: List[SecurityAlert] = []
-        self.event_history: deque = deque(maxlen=10000)  # Keep last 10k events
-        self.ip_activity: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
-        self.user_activity: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self.alerts: deque = deque(maxlen=ALERT_HISTORY_MAX_ALERTS)
+        # Index of self.alerts by alert type, oldest first
+        self.alerts_by_type: Dict[str, deque] = defaultdict(deque)
+        self.event_history: deque = deque(maxlen=EVENT_HISTORY_MAX_EVENTS)
+        self.ip_activity: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=ACTIVITY_MAX_EVENTS_PER_KEY)
+        )
+        self.user_activity: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=ACTIVITY_MAX_EVENTS_PER_KEY)
+        )
+        # Failed login token buckets: key -> (tokens, last refill timestamp)
+        self.ip_failure_buckets: Dict[str, Tuple[float, float]] = {}
+        self.user_failure_buckets: Dict[str, Tuple[float, float]] = {}
         self.blocked_ips: Set[str] = set()
+        # (monotonic build time, dashboard) of the last computed dashboard
+        self._dashboard_cache: Tuple[float, Optional[Dict]] = (float("-inf"), None)
         self.suspicious_ips: Set[str] = set()
         
         # Thresholds for detection
@@ -110,19 +147,58 @@ class SecurityMonitor:
         # Check for endpoint scanning
         self._check_endpoint_scanning(ip_address)
     
+    def _consume_failure_token(
+        self,
+        buckets: Dict[str, Tuple[float, float]],
+        key: str,
+        threshold: int,
+        current_time: float
+    ) -> float:
+        """
+        Take one token from a failed login bucket.
+        
+        Each bucket holds threshold - 1 tokens and refills at threshold tokens
+        per FAILED_LOGIN_WINDOW_SECONDS, so the balance drops below zero on the
+        threshold-th failure in a burst and stays there while failures keep
+        arriving faster than the threshold rate. Debt is capped at one window.
+        
+        Args:
+            buckets: Bucket map to update
+            key: IP address or user ID
+            threshold: Failures per window that trigger detection
+            current_time: Current timestamp
+            
+        Returns:
+            Remaining tokens; negative once the threshold is exceeded
+        """
+        capacity = threshold - 1
+        tokens, last_refill = buckets.get(key, (capacity, current_time))
+        refill_rate = threshold / FAILED_LOGIN_WINDOW_SECONDS
+        tokens = min(capacity, tokens + (current_time - last_refill) * refill_rate) - 1
+        tokens = max(tokens, -threshold)
+        buckets[key] = (tokens, current_time)
+        return tokens
+    
+    def _recent_failures(self, activity: deque, count: int) -> List[Dict]:
+        """Return the last `count` authentication failures from an activity ring, oldest first."""
+        failures = islice(
+            (event for event in reversed(activity)
+             if event["event_type"] == "authentication_failure"),
+            count
+        )
+        return list(failures)[::-1]
+    
     def _check_brute_force_attack(self, ip_address: str, user_id: str = None):
         """Check for brute force attacks."""
         current_time = time.time()
-        hour_ago = current_time - 3600
         
         # Check failed logins from IP
-        ip_failures = [
-            event for event in self.ip_activity[ip_address]
-            if (event["timestamp"] > hour_ago and 
-                event["event_type"] == "authentication_failure")
-        ]
+        threshold = self.thresholds["failed_logins_per_ip"]
+        tokens = self._consume_failure_token(
+            self.ip_failure_buckets, ip_address, threshold, current_time
+        )
         
-        if len(ip_failures) >= self.thresholds["failed_logins_per_ip"]:
+        if tokens < 0:
             self.blocked_ips.add(ip_address)
             self._create_alert(
                 alert_type="brute_force_attack_ip",
@@ -130,31 +206,35 @@ class SecurityMonitor:
                 message=f"Brute force attack detected from IP {ip_address}",
                 details={
                     "ip": ip_address,
-                    "failed_attempts": len(ip_failures),
+                    "failed_attempts": round(threshold - 1 - tokens),
                     "time_window": "1 hour"
                 },
-                source_events=[str(event) for event in ip_failures[-5:]]
+                source_events=[
+                    str(event) for event in self._recent_failures(self.ip_activity[ip_address], 5)
+                ]
             )
         
         # Check failed logins for user
         if user_id:
-            user_failures = [
-                event for event in self.user_activity[user_id]
-                if (event["timestamp"] > hour_ago and 
-                    event["event_type"] == "authentication_failure")
-            ]
+            threshold = self.thresholds["failed_logins_per_user"]
+            tokens = self._consume_failure_token(
+                self.user_failure_buckets, user_id, threshold, current_time
+            )
             
-            if len(user_failures) >= self.thresholds["failed_logins_per_user"]:
+            if tokens < 0:
                 self._create_alert(
                     alert_type="brute_force_attack_user",
                     level=AlertLevel.HIGH,
                     message=f"Multiple failed login attempts for user {user_id}",
                     details={
                         "user_id": user_id,
-                        "failed_attempts": len(user_failures),
+                        "failed_attempts": round(threshold - 1 - tokens),
                         "time_window": "1 hour"
                     },
-                    source_events=[str(event) for event in user_failures]
+                    source_events=[
+                        str(event)
+                        for event in self._recent_failures(self.user_activity[user_id], threshold)
+                    ]
                 )
     
     def _check_request_rate(self, ip_address: str):
@@ -219,7 +299,16 @@ class SecurityMonitor:
             source_events=source_events
         )
         
+        if len(self.alerts) == self.alerts.maxlen:
+            # The oldest alert is about to be overwritten; drop it from the index too
+            evicted = self.alerts[0]
+            same_type = self.alerts_by_type.get(evicted.alert_type)
+            if same_type and same_type[0] is evicted:
+                same_type.popleft()
+                if not same_type:
+                    del self.alerts_by_type[evicted.alert_type]
         self.alerts.append(alert)
+        self.alerts_by_type[alert_type].append(alert)
         
         # Log the alert
         print(f"🚨 SECURITY ALERT [{level}]: {message}")
@@ -228,6 +317,15 @@ class SecurityMonitor:
         if level in [AlertLevel.HIGH, AlertLevel.CRITICAL]:
             self._send_alert_notification(alert)
     
+    def alerts_of_type(self, alert_type: str) -> List[SecurityAlert]:
+        """Return retained alerts of one type, oldest first."""
+        return list(self.alerts_by_type.get(alert_type, ()))
+    
+    def clear_alerts(self):
+        """Discard all retained alerts."""
+        self.alerts.clear()
+        self.alerts_by_type.clear()
+    
     def _send_alert_notification(self, alert: SecurityAlert):
         """Send alert notification (placeholder for real implementation)."""
         # In a real implementation, this would send notifications via:
@@ -272,26 +370,27 @@ class SecurityMonitor:
     
     def _cleanup_old_data(self, current_time: float):
         """Clean up old monitoring data."""
-        # Remove events older than 24 hours
-        day_ago = current_time - 86400
-        
-        # Clean IP activity
-        for ip in list(self.ip_activity.keys()):
-            self.ip_activity[ip] = deque(
-                [event for event in self.ip_activity[ip] if event["timestamp"] > day_ago],
-                maxlen=1000
-            )
-            if not self.ip_activity[ip]:
-                del self.ip_activity[ip]
-        
-        # Clean user activity
-        for user_id in list(self.user_activity.keys()):
-            self.user_activity[user_id] = deque(
-                [event for event in self.user_activity[user_id] if event["timestamp"] > day_ago],
-                maxlen=1000
-            )
-            if not self.user_activity[user_id]:
-                del self.user_activity[user_id]
+        # Remove events older than the retention window
+        cutoff = current_time - ACTIVITY_RETENTION_SECONDS
+        
+        for activity in (self.ip_activity, self.user_activity):
+            for key in list(activity.keys()):
+                events = activity[key]
+                # Events are appended in time order, so expired ones sit at the left
+                while events and events[0]["timestamp"] <= cutoff:
+                    events.popleft()
+                if not events:
+                    del activity[key]
+        
+        # Drop failure buckets that have fully refilled
+        for buckets, threshold in (
+            (self.ip_failure_buckets, self.thresholds["failed_logins_per_ip"]),
+            (self.user_failure_buckets, self.thresholds["failed_logins_per_user"])
+        ):
+            refill_rate = threshold / FAILED_LOGIN_WINDOW_SECONDS
+            for key, (tokens, last_refill) in list(buckets.items()):
+                if tokens + (current_time - last_refill) * refill_rate >= threshold - 1:
+                    del buckets[key]
     
     def _analyze_trends(self):
         """Analyze security trends."""
@@ -324,21 +423,37 @@ class SecurityMonitor:
         pass
     
     def get_security_dashboard(self) -> Dict:
-        """Get security dashboard data."""
+        """
+        Get security dashboard data.
+        
+        The dashboard is rebuilt at most every DASHBOARD_CACHE_TTL_SECONDS;
+        polls in between share the last result.
+        """
+        now = time.monotonic()
+        built_at, dashboard = self._dashboard_cache
+        if dashboard is not None and now - built_at < DASHBOARD_CACHE_TTL_SECONDS:
+            return dashboard
+        
+        dashboard = self._build_security_dashboard()
+        self._dashboard_cache = (now, dashboard)
+        return dashboard
+    
+    def _build_security_dashboard(self) -> Dict:
+        """Compute security dashboard data from the current monitoring state."""
         current_time = time.time()
         hour_ago = current_time - 3600
         day_ago = current_time - 86400
         
-        recent_events = [
-            event for event in self.event_history
-            if event["timestamp"] > hour_ago
-        ]
-        
         daily_events = [
             event for event in self.event_history
             if event["timestamp"] > day_ago
         ]
         
+        recent_events = [
+            event for event in daily_events
+            if event["timestamp"] > hour_ago
+        ]
+        
         return {
             "timestamp": datetime.now().isoformat(),
             "alerts": {
@@ -355,14 +470,7 @@ class SecurityMonitor:
                 "suspicious_ips": len(self.suspicious_ips)
             },
             "top_event_types": dict(
-                sorted(
-                    defaultdict(int, {
-                        event["event_type"]: sum(1 for e in recent_events if e["event_type"] == event["event_type"])
-                        for event in recent_events
-                    }).items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:10]
+                Counter(event["event_type"] for event in recent_events).most_common(10)
             )
         }
     
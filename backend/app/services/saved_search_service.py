@@ -4,8 +4,9 @@ import json
 import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import Integer, String, cast, desc, func, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 
 from ..models.database import SavedSearchDB
 from ..models.search import (
@@ -15,6 +16,10 @@ from ..models.search import (
 
 logger = logging.getLogger(__name__)
 
+# Unique (recruiter_id, name) index; SQLite reports the columns instead of the index name
+DUPLICATE_NAME_INDEX = "idx_saved_searches_recruiter_name"
+DUPLICATE_NAME_SQLITE_MESSAGE = "UNIQUE constraint failed: saved_searches.recruiter_id, saved_searches.name"
+
 
 class SavedSearchService:
     """Service for managing saved searches and search history."""
@@ -43,15 +48,6 @@ class SavedSearchService:
             RuntimeError: If database operation fails
         """
         try:
-            # Check if search name already exists for this recruiter
-            existing_search = self.db.query(SavedSearchDB).filter(
-                SavedSearchDB.recruiter_id == recruiter_id,
-                SavedSearchDB.name == request.name
-            ).first()
-            
-            if existing_search:
-                raise ValueError(f"Search with name '{request.name}' already exists")
-            
             # Convert filters to JSON string if present
             filters_json = None
             if request.criteria.filters:
@@ -74,26 +70,115 @@ class SavedSearchService:
             
             return self._convert_to_response(saved_search)
             
-        except ValueError:
-            raise
+        except IntegrityError as e:
+            self.db.rollback()
+            if self._is_duplicate_name_error(e):
+                raise ValueError(f"Search with name '{request.name}' already exists")
+            logger.error(f"Failed to create saved search: {e}")
+            raise RuntimeError(f"Failed to create saved search: {str(e)}")
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to create saved search: {e}")
             raise RuntimeError(f"Failed to create saved search: {str(e)}")
     
+    def create_saved_searches_bulk(
+        self,
+        recruiter_id: str,
+        requests: List[SavedSearchCreateRequest]
+    ) -> List[SavedSearchResponse]:
+        """
+        Create several saved searches for a recruiter in a single transaction.
+        
+        Args:
+            recruiter_id: ID of the recruiter creating the searches
+            requests: Saved search creation requests
+            
+        Returns:
+            Created saved search responses, in request order
+            
+        Raises:
+            ValueError: If any search name is repeated or already exists for this recruiter
+            RuntimeError: If database operation fails
+        """
+        if not requests:
+            return []
+        
+        names = [request.name for request in requests]
+        if len(set(names)) != len(names):
+            raise ValueError("Search names must be unique")
+        
+        try:
+            # Check all names against existing searches in one query
+            existing_names = {
+                row[0] for row in self.db.query(SavedSearchDB.name).filter(
+                    SavedSearchDB.recruiter_id == recruiter_id,
+                    SavedSearchDB.name.in_(names)
+                ).all()
+            }
+            
+            if existing_names:
+                duplicate = next(name for name in names if name in existing_names)
+                raise ValueError(f"Search with name '{duplicate}' already exists")
+            
+            saved_searches = [
+                SavedSearchDB(
+                    recruiter_id=recruiter_id,
+                    name=request.name,
+                    requirements=request.criteria.requirements,
+                    filters=json.dumps(request.criteria.filters) if request.criteria.filters else None,
+                    limit=str(request.criteria.limit) if request.criteria.limit else None
+                )
+                for request in requests
+            ]
+            
+            self.db.add_all(saved_searches)
+            self.db.commit()
+            
+            # Reload the rows (with server defaults) in one query rather than per object
+            search_ids = [saved_search.id for saved_search in saved_searches]
+            created_by_id = {
+                saved_search.id: saved_search
+                for saved_search in self.db.query(SavedSearchDB).filter(
+                    SavedSearchDB.id.in_(search_ids)
+                ).populate_existing()
+            }
+            
+            logger.info(f"Created {len(saved_searches)} saved searches for recruiter {recruiter_id}")
+            
+            return [self._convert_to_response(created_by_id[search_id]) for search_id in search_ids]
+            
+        except ValueError:
+            raise
+        except IntegrityError as e:
+            # A concurrent insert can take a name between the check above and the commit
+            self.db.rollback()
+            if self._is_duplicate_name_error(e):
+                raise ValueError("Search with one of these names already exists")
+            logger.error(f"Failed to create saved searches: {e}")
+            raise RuntimeError(f"Failed to create saved searches: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to create saved searches: {e}")
+            raise RuntimeError(f"Failed to create saved searches: {str(e)}")
+    
     def get_saved_searches(
         self, 
         recruiter_id: str,
         limit: Optional[int] = None,
-        offset: Optional[int] = None
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None
     ) -> SavedSearchListResponse:
         """
         Get all saved searches for a recruiter.
         
+        Pages can be fetched either by offset or, without rescanning skipped
+        rows, by passing the previous page's next_cursor as cursor.
+        
         Args:
             recruiter_id: ID of the recruiter
             limit: Maximum number of searches to return
-            offset: Number of searches to skip
+            offset: Number of searches to skip (ignored when cursor is given)
+            cursor: next_cursor from the previous page
             
         Returns:
             List of saved searches
@@ -101,19 +186,39 @@ class SavedSearchService:
         try:
             query = self.db.query(SavedSearchDB).filter(
                 SavedSearchDB.recruiter_id == recruiter_id
-            ).order_by(desc(SavedSearchDB.created_at))
+            )
             
             # Get total count
             total_count = query.count()
             
+            # Newest first; id breaks created_at ties so the keyset order is total
+            query = query.order_by(desc(SavedSearchDB.created_at), desc(SavedSearchDB.id))
+            
             # Apply pagination if specified
-            if offset:
+            if cursor:
+                # Keyset: rows strictly after the cursor row, compared against the
+                # stored values so the comparison matches the ORDER BY exactly
+                cursor_row = aliased(SavedSearchDB)
+                query = query.filter(
+                    tuple_(SavedSearchDB.created_at, SavedSearchDB.id) < select(
+                        cursor_row.created_at, cursor_row.id
+                    ).where(
+                        cursor_row.id == cursor,
+                        cursor_row.recruiter_id == recruiter_id
+                    ).scalar_subquery()
+                )
+            elif offset:
                 query = query.offset(offset)
             if limit:
                 query = query.limit(limit)
             
             saved_searches = query.all()
             
+            # A full page may have more rows after it
+            next_cursor = None
+            if limit and len(saved_searches) == limit:
+                next_cursor = saved_searches[-1].id
+            
             # Convert to response models
             search_responses = [
                 self._convert_to_response(search) for search in saved_searches
@@ -123,7 +228,8 @@ class SavedSearchService:
             
             return SavedSearchListResponse(
                 searches=search_responses,
-                total_count=total_count
+                total_count=total_count,
+                next_cursor=next_cursor
             )
             
         except Exception as e:
@@ -142,10 +248,7 @@ class SavedSearchService:
             Saved search response or None if not found
         """
         try:
-            saved_search = self.db.query(SavedSearchDB).filter(
-                SavedSearchDB.id == search_id,
-                SavedSearchDB.recruiter_id == recruiter_id
-            ).first()
+            saved_search = self._get_owned_search(recruiter_id, search_id)
             
             if not saved_search:
                 return None
@@ -178,10 +281,7 @@ class SavedSearchService:
             RuntimeError: If database operation fails
         """
         try:
-            saved_search = self.db.query(SavedSearchDB).filter(
-                SavedSearchDB.id == search_id,
-                SavedSearchDB.recruiter_id == recruiter_id
-            ).first()
+            saved_search = self._get_owned_search(recruiter_id, search_id)
             
             if not saved_search:
                 return None
@@ -244,10 +344,7 @@ class SavedSearchService:
             RuntimeError: If database operation fails
         """
         try:
-            saved_search = self.db.query(SavedSearchDB).filter(
-                SavedSearchDB.id == search_id,
-                SavedSearchDB.recruiter_id == recruiter_id
-            ).first()
+            saved_search = self._get_owned_search(recruiter_id, search_id)
             
             if not saved_search:
                 return False
@@ -275,22 +372,30 @@ class SavedSearchService:
             Search criteria or None if not found
         """
         try:
-            saved_search = self.db.query(SavedSearchDB).filter(
-                SavedSearchDB.id == search_id,
-                SavedSearchDB.recruiter_id == recruiter_id
-            ).first()
+            # Update usage statistics atomically and read the row back in one statement
+            # (use_count is stored as text, so the increment casts through INTEGER)
+            stmt = (
+                update(SavedSearchDB)
+                .where(
+                    SavedSearchDB.id == search_id,
+                    SavedSearchDB.recruiter_id == recruiter_id
+                )
+                .values(
+                    use_count=cast(
+                        cast(func.coalesce(SavedSearchDB.use_count, "0"), Integer) + 1,
+                        String
+                    ),
+                    last_used_at=datetime.utcnow()
+                )
+                .returning(SavedSearchDB)
+            )
+            saved_search = self.db.execute(stmt).scalar_one_or_none()
             
             if not saved_search:
+                self.db.rollback()
                 return None
             
-            # Update usage statistics
-            saved_search.last_used_at = datetime.utcnow()
-            current_count = int(saved_search.use_count or "0")
-            saved_search.use_count = str(current_count + 1)
-            
-            self.db.commit()
-            
-            # Convert back to SearchRequest
+            # Convert back to SearchRequest (before commit expires the returned row)
             filters = None
             if saved_search.filters:
                 filters = json.loads(saved_search.filters)
@@ -305,6 +410,8 @@ class SavedSearchService:
                 limit=limit
             )
             
+            self.db.commit()
+            
             logger.info(f"Used saved search {search_id} for recruiter {recruiter_id}")
             return search_request
             
@@ -357,6 +464,44 @@ class SavedSearchService:
         
         return validation_result
     
+    def _get_owned_search(self, recruiter_id: str, search_id: str) -> Optional[SavedSearchDB]:
+        """
+        Look up a saved search by primary key and check it belongs to the recruiter.
+        
+        Session.get() serves repeat lookups from the identity map before
+        selecting by primary key.
+        
+        Args:
+            recruiter_id: ID of the recruiter
+            search_id: ID of the saved search
+            
+        Returns:
+            Saved search or None if not found or owned by another recruiter
+        """
+        saved_search = self.db.get(SavedSearchDB, search_id)
+        if saved_search is None or saved_search.recruiter_id != recruiter_id:
+            return None
+        return saved_search
+    
+    @staticmethod
+    def _is_duplicate_name_error(error: IntegrityError) -> bool:
+        """
+        Check whether an IntegrityError came from the unique (recruiter_id, name) index.
+        
+        Args:
+            error: Error raised on commit
+            
+        Returns:
+            True for a duplicate search name, False for any other constraint
+        """
+        diag = getattr(error.orig, "diag", None)
+        constraint_name = getattr(diag, "constraint_name", None)
+        if constraint_name is not None:
+            return constraint_name == DUPLICATE_NAME_INDEX
+        
+        message = str(error.orig)
+        return DUPLICATE_NAME_INDEX in message or DUPLICATE_NAME_SQLITE_MESSAGE in message
+    
     def _convert_to_response(self, saved_search: SavedSearchDB) -> SavedSearchResponse:
         """
         Convert database model to response model.
@@ -1,9 +1,12 @@
 """Search service for SecureHR application."""
 
+import bisect
 import logging
 import re
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 from .cyborgdb_service import CyborgDBService
@@ -11,6 +14,45 @@ from ..models.database import UserDB
 
 logger = logging.getLogger(__name__)
 
+# Lower bounds of the fair/good/excellent score tiers, and the tier names they index
+SCORE_TIER_BOUNDARIES = np.array([0.4, 0.6, 0.8])
+SCORE_TIER_NAMES = np.array(["poor", "fair", "good", "excellent"])
+
+# Number of distinct preprocessed queries memoized
+PREPROCESS_CACHE_SIZE = 4096
+
+# Characters removed from search queries (keep alphanumeric, spaces, and common punctuation)
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\.,;:\-\(\)\/]')
+
+
+@lru_cache(maxsize=PREPROCESS_CACHE_SIZE)
+def _preprocess_query(requirements_text: str) -> str:
+    """
+    Normalize search query text (memoized; invalid input raises and is not cached).
+    
+    Args:
+        requirements_text: Raw job requirements text
+        
+    Returns:
+        Cleaned requirements text
+        
+    Raises:
+        ValueError: If requirements text is invalid
+    """
+    if not requirements_text or not requirements_text.strip():
+        raise ValueError("Job requirements cannot be empty")
+    
+    # Remove excessive whitespace
+    cleaned_text = " ".join(requirements_text.strip().split())
+    
+    # Validate minimum length (at least 10 characters for meaningful search)
+    if len(cleaned_text) < 10:
+        raise ValueError("Job requirements must be at least 10 characters long")
+    
+    # Remove special characters that might interfere with search
+    cleaned_text = _SPECIAL_CHARS_RE.sub(' ', cleaned_text)
+    return " ".join(cleaned_text.split())
+
 
 class SearchService:
     """Service for handling job requirement searches and candidate matching."""
@@ -32,32 +74,19 @@ class SearchService:
         Raises:
             ValueError: If requirements text is invalid
         """
-        if not requirements_text or not requirements_text.strip():
-            raise ValueError("Job requirements cannot be empty")
-        
-        # Remove excessive whitespace
-        cleaned_text = " ".join(requirements_text.strip().split())
-        
-        # Validate minimum length (at least 10 characters for meaningful search)
-        if len(cleaned_text) < 10:
-            raise ValueError("Job requirements must be at least 10 characters long")
-        
-        # Remove special characters that might interfere with search
-        # Keep alphanumeric, spaces, and common punctuation
-        cleaned_text = re.sub(r'[^\w\s\.,;:\-\(\)\/]', ' ', cleaned_text)
-        cleaned_text = " ".join(cleaned_text.split())
+        cleaned_text = _preprocess_query(requirements_text)
         
         logger.info(f"Preprocessed search query: {len(cleaned_text)} characters")
         return cleaned_text
     
-    def validate_search_parameters(
-        self, 
+    def _validate_params_reason(
+        self,
         requirements_text: str,
         limit: Optional[int] = None,
         filters: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> Tuple[bool, Optional[str], Optional[Dict[str, Any]]]:
         """
-        Validate search parameters before executing search.
+        Validate search parameters without raising.
         
         Args:
             requirements_text: Job requirements text
@@ -65,64 +94,130 @@ class SearchService:
             filters: Optional search filters
             
         Returns:
-            Validated parameters dictionary
-            
-        Raises:
-            ValueError: If parameters are invalid
+            Tuple of (is_valid, failure_reason, validated_params); the reason is
+            None when valid and validated_params is None when invalid
         """
-        validated_params = {}
-        
         # Validate requirements text
         if not requirements_text or not requirements_text.strip():
-            raise ValueError("Job requirements cannot be empty")
-        validated_params["requirements_text"] = requirements_text.strip()
+            return False, "Job requirements cannot be empty", None
         
         # Validate limit
         if limit is not None:
             if not isinstance(limit, int) or limit < 1:
-                raise ValueError("Limit must be a positive integer")
+                return False, "Limit must be a positive integer", None
             if limit > 100:
-                raise ValueError("Limit cannot exceed 100 results")
-            validated_params["limit"] = limit
+                return False, "Limit cannot exceed 100 results", None
         else:
-            validated_params["limit"] = 10  # Default limit
+            limit = 10  # Default limit
         
         # Validate filters
         if filters is not None:
             if not isinstance(filters, dict):
-                raise ValueError("Filters must be a dictionary")
+                return False, "Filters must be a dictionary", None
             # Add filter validation logic here as needed
-            validated_params["filters"] = filters
         else:
-            validated_params["filters"] = {}
+            filters = {}
+        
+        return True, None, {
+            "requirements_text": requirements_text.strip(),
+            "limit": limit,
+            "filters": filters
+        }
+    
+    def validate_search_parameters(
+        self, 
+        requirements_text: str,
+        limit: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate search parameters before executing search.
+        
+        Args:
+            requirements_text: Job requirements text
+            limit: Maximum number of results
+            filters: Optional search filters
+            
+        Returns:
+            Validated parameters dictionary
+            
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        is_valid, reason, validated_params = self._validate_params_reason(
+            requirements_text, limit, filters
+        )
+        if not is_valid:
+            raise ValueError(reason)
         
         logger.info(f"Validated search parameters: limit={validated_params['limit']}")
         return validated_params
     
-    def rank_search_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def validate_search_parameters_batch(
+        self,
+        requests: List[Dict[str, Any]]
+    ) -> List[Tuple[bool, Optional[str], Optional[Dict[str, Any]]]]:
+        """
+        Validate many sets of search parameters without raising per item.
+        
+        Args:
+            requests: Parameter dicts with a requirements_text key and optional
+                limit and filters keys
+            
+        Returns:
+            (is_valid, failure_reason, validated_params) for each request, in order
+        """
+        results = [
+            self._validate_params_reason(
+                request.get("requirements_text"),
+                request.get("limit"),
+                request.get("filters")
+            )
+            for request in requests
+        ]
+        
+        logger.info(f"Validated {len(results)} search parameter sets")
+        return results
+    
+    def rank_search_results(
+        self,
+        results: List[Dict[str, Any]],
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Rank and score search results based on similarity and other factors.
         
         Args:
             results: Raw search results from CyborgDB
+            top_k: Only rank and return the best top_k results (None for all)
             
         Returns:
             Ranked and scored results
         """
-        if not results:
-            return results
+        if not results or (top_k is not None and top_k < 1):
+            return []
         
-        # Sort by similarity score (descending)
-        ranked_results = sorted(
-            results, 
-            key=lambda x: x.get("similarity_score", 0.0), 
-            reverse=True
+        # Sort by similarity score (descending, ties keep their original order)
+        scores = np.fromiter(
+            (r.get("similarity_score", 0.0) for r in results),
+            dtype=np.float64,
+            count=len(results)
         )
+        if top_k is not None and top_k < len(results):
+            # Partition out the top k in O(N), then sort only those
+            order = np.sort(np.argpartition(-scores, top_k - 1)[:top_k])
+            order = order[np.argsort(-scores[order], kind="stable")]
+        else:
+            order = np.argsort(-scores, kind="stable")
+        tiers = SCORE_TIER_NAMES[np.digitize(scores[order], SCORE_TIER_BOUNDARIES)]
         
         # Add ranking information
-        for i, result in enumerate(ranked_results):
-            result["rank"] = i + 1
-            result["score_tier"] = self._get_score_tier(result.get("similarity_score", 0.0))
+        ranked_results = []
+        for rank, (idx, tier) in enumerate(zip(order.tolist(), tiers.tolist()), start=1):
+            result = results[idx]
+            result["rank"] = rank
+            result["score_tier"] = tier
+            ranked_results.append(result)
         
         logger.info(f"Ranked {len(ranked_results)} search results")
         return ranked_results
@@ -137,19 +232,13 @@ class SearchService:
         Returns:
             Score tier category
         """
-        if similarity_score >= 0.8:
-            return "excellent"
-        elif similarity_score >= 0.6:
-            return "good"
-        elif similarity_score >= 0.4:
-            return "fair"
-        else:
-            return "poor"
+        return str(SCORE_TIER_NAMES[np.digitize(similarity_score, SCORE_TIER_BOUNDARIES)])
     
     def filter_search_results(
         self, 
         results: List[Dict[str, Any]], 
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        results_sorted_desc: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Apply additional filtering to search results.
@@ -157,6 +246,8 @@ class SearchService:
         Args:
             results: Search results to filter
             filters: Filter criteria
+            results_sorted_desc: Whether results are already ordered by descending
+                similarity score (as returned by rank_search_results)
             
         Returns:
             Filtered results
@@ -169,10 +260,19 @@ class SearchService:
         # Apply minimum similarity score filter
         min_score = filters.get("min_similarity_score")
         if min_score is not None:
-            filtered_results = [
-                r for r in filtered_results 
-                if r.get("similarity_score", 0.0) >= min_score
-            ]
+            if results_sorted_desc:
+                # Qualifying results form a prefix, so binary search for its end
+                cutoff = bisect.bisect_right(
+                    filtered_results,
+                    -min_score,
+                    key=lambda r: -r.get("similarity_score", 0.0)
+                )
+                filtered_results = filtered_results[:cutoff]
+            else:
+                filtered_results = [
+                    r for r in filtered_results 
+                    if r.get("similarity_score", 0.0) >= min_score
+                ]
         
         # Apply maximum results filter
         max_results = filters.get("max_results")
@@ -234,6 +334,37 @@ class SearchService:
             }
         }
     
+    async def _collect_candidate_hits(
+        self,
+        query_text: str,
+        limit: int,
+        min_score: Optional[float] = None,
+        exclude_candidate_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the top `limit` hits from CyborgDB with a single query.
+        
+        Hits below min_score are dropped here, before candidate info is looked
+        up for them.
+        
+        Args:
+            query_text: Preprocessed query text
+            limit: Number of hits to request
+            min_score: Minimum similarity score that results are filtered to
+            exclude_candidate_ids: Candidate IDs to exclude from results
+            
+        Returns:
+            Up to `limit` hits scoring at least min_score
+        """
+        hits = await self.cyborgdb_service.search_similar_vectors(
+            query_text=query_text,
+            limit=limit,
+            exclude_candidate_ids=exclude_candidate_ids
+        )
+        if min_score is None:
+            return hits
+        return [hit for hit in hits if hit.get("similarity_score", 0.0) >= min_score]
+    
     async def search_candidates(
         self,
         requirements_text: str,
@@ -277,9 +408,11 @@ class SearchService:
             )
             
             # Search using CyborgDB (it will generate embeddings automatically)
-            raw_results = await self.cyborgdb_service.search_similar_vectors(
+            min_score = (validated_params.get("filters") or {}).get("min_similarity_score")
+            raw_results = await self._collect_candidate_hits(
                 query_text=cleaned_requirements,
                 limit=validated_params["limit"],
+                min_score=min_score,
                 exclude_candidate_ids=exclude_candidate_ids
             )
             
@@ -309,7 +442,9 @@ class SearchService:
             ranked_results = self.rank_search_results(raw_results)
             
             # Apply additional filtering
-            filtered_results = self.filter_search_results(ranked_results, filters)
+            filtered_results = self.filter_search_results(
+                ranked_results, filters, results_sorted_desc=True
+            )
             
             # Apply pagination if requested
             if page_size is not None:
@@ -2,13 +2,31 @@
 
 import re
 import html
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import HTTPException, status
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def compile_pattern_union(patterns: Tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    Compile detection patterns into one case-insensitive alternation.
+    
+    A single search over the union replaces one re.search call per pattern,
+    and the compiled union is cached per pattern set.
+    
+    Args:
+        patterns: Regular expressions to combine
+        
+    Returns:
+        Compiled pattern matching wherever any of the inputs matches
+    """
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
 class InputValidator:
     """Comprehensive input validation and sanitization utilities."""
     
@@ -341,11 +359,7 @@ class InputValidator:
         if not isinstance(text, str):
             return False
         
-        text_lower = text.lower()
-        for pattern in patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                return True
-        return False
+        return compile_pattern_union(tuple(patterns)).search(text) is not None
     
     @classmethod
     def validate_pagination_params(cls, skip: int = 0, limit: int = 10) -> tuple:
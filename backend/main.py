@@ -2,6 +2,8 @@
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api import auth, cv, search, profile, security
 from app.database import init_db
@@ -16,7 +18,15 @@ from app.middleware.audit import AuditMiddleware, PrivacyComplianceMiddleware
 
 settings = get_settings()
 
-app = FastAPI(title="SecureHR API", version="1.0.0")
+# Smallest response body, in bytes, worth gzip-compressing
+GZIP_MINIMUM_SIZE_BYTES = 500
+
+# orjson serializes response payloads (profiles, notifications, uploads) natively
+app = FastAPI(
+    title="SecureHR API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # Security middleware (order matters - add from innermost to outermost)
 # Privacy compliance monitoring (innermost)
@@ -56,6 +66,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (dashboards, search results) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE_BYTES)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(cv.router)
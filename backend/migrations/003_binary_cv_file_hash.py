@@ -0,0 +1,23 @@
+"""Store CV file hashes as raw SHA256 digests instead of hex strings."""
+
+from sqlalchemy import text
+
+
+def upgrade(engine):
+    """Convert cv_vectors.file_hash from hex VARCHAR to BYTEA."""
+    with engine.connect() as connection:
+        connection.execute(text("""
+            ALTER TABLE cv_vectors
+            ALTER COLUMN file_hash TYPE BYTEA USING decode(file_hash, 'hex')
+        """))
+        connection.commit()
+
+
+def downgrade(engine):
+    """Convert cv_vectors.file_hash back to hex VARCHAR."""
+    with engine.connect() as connection:
+        connection.execute(text("""
+            ALTER TABLE cv_vectors
+            ALTER COLUMN file_hash TYPE VARCHAR USING encode(file_hash, 'hex')
+        """))
+        connection.commit()
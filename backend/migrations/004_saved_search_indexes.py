@@ -0,0 +1,27 @@
+"""Add composite indexes on saved searches for per-recruiter lookups."""
+
+from sqlalchemy import text
+
+
+def upgrade(engine):
+    """Add (recruiter_id, name) unique and (recruiter_id, created_at) indexes."""
+    with engine.connect() as connection:
+        connection.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_saved_searches_recruiter_name
+            ON saved_searches (recruiter_id, name)
+        """))
+        
+        connection.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_saved_searches_recruiter_created
+            ON saved_searches (recruiter_id, created_at)
+        """))
+        
+        connection.commit()
+
+
+def downgrade(engine):
+    """Remove the composite saved search indexes."""
+    with engine.connect() as connection:
+        connection.execute(text("DROP INDEX IF EXISTS idx_saved_searches_recruiter_created"))
+        connection.execute(text("DROP INDEX IF EXISTS idx_saved_searches_recruiter_name"))
+        connection.commit()
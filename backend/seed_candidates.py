@@ -16,10 +16,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "backend"))
 
 from sqlalchemy.orm import Session
-from app.database import get_db, engine
+from app.database import get_db, engine, SessionLocal
 from app.models.database import Base, UserDB
 from app.models.user import UserRole, CVProcessingStatus
 from app.services.cv_processor import CVProcessorService
+from app.services.cyborgdb_service import CyborgDBService, StoreBatch
 from app.services.auth import auth_service
 from fastapi import UploadFile
 import uuid
@@ -105,22 +106,21 @@ class MockUploadFile:
         self.filename = os.path.basename(filepath)
         self.content_type = "application/pdf"
         self.size = os.path.getsize(filepath)
-        self._file = None
+        self.file = None
     
-    async def read(self) -> bytes:
-        with open(self.filepath, "rb") as f:
-            return f.read()
+    async def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
     
     async def seek(self, position: int):
-        pass
+        self.file.seek(position)
     
     def __enter__(self):
-        self._file = open(self.filepath, "rb")
+        self.file = open(self.filepath, "rb")
         return self
     
     def __exit__(self, *args):
-        if self._file:
-            self._file.close()
+        if self.file:
+            self.file.close()
 
 
 async def create_or_get_user(db: Session, candidate_data: dict) -> tuple[UserDB, bool]:
@@ -156,25 +156,27 @@ async def create_or_get_user(db: Session, candidate_data: dict) -> tuple[UserDB,
     return new_user, True
 
 
-async def process_cv_for_user(db: Session, user: UserDB, cv_path: str) -> dict:
+async def process_cv_for_user(db: Session, user: UserDB, cv_path: str, store_batch: StoreBatch) -> dict:
     """
     Process CV for a user and return timing information.
+    The CyborgDB store goes through the shared batch with the other candidates.
     Returns dict with timing details.
     """
     cv_processor = CVProcessorService()
-    mock_file = MockUploadFile(cv_path)
     
-    # Time the entire CV processing
-    total_start = time.time()
-    
-    # Process CV completely: extract text, generate vector, encrypt, and store
-    cyborgdb_vector_id = await cv_processor.process_cv_complete(
-        file=mock_file,
-        candidate_id=user.id,
-        db=db
-    )
-    
-    total_time = time.time() - total_start
+    with MockUploadFile(cv_path) as mock_file:
+        # Time the entire CV processing
+        total_start = time.time()
+        
+        # Process CV completely: extract text, generate vector, encrypt, and store
+        cyborgdb_vector_id = await cv_processor.process_cv_complete(
+            file=mock_file,
+            candidate_id=user.id,
+            db=db,
+            store_batch=store_batch
+        )
+        
+        total_time = time.time() - total_start
     
     # Update user's CV status fields
     user.cv_uploaded_at = datetime.utcnow()
@@ -188,9 +190,10 @@ async def process_cv_for_user(db: Session, user: UserDB, cv_path: str) -> dict:
     }
 
 
-async def process_candidate(db: Session, candidate_data: dict, index: int, total: int) -> dict:
+async def process_candidate(candidate_data: dict, index: int, total: int, store_batch: StoreBatch) -> dict:
     """
     Process a single candidate: create/get user and upload CV.
+    Uses its own database session so candidates can be processed concurrently.
     Returns result dict with status and timing.
     """
     cv_path = os.path.join(CV_FOLDER, candidate_data["cv_file"])
@@ -212,6 +215,7 @@ async def process_candidate(db: Session, candidate_data: dict, index: int, total
         print(f"  ❌ {result['error']}")
         return result
     
+    db = SessionLocal()
     try:
         # Step 1: Create or get user
         user, is_new = await create_or_get_user(db, candidate_data)
@@ -224,7 +228,7 @@ async def process_candidate(db: Session, candidate_data: dict, index: int, total
         
         # Step 2: Process CV
         print(f"  ⏳ Processing CV: {candidate_data['cv_file']}...")
-        cv_result = await process_cv_for_user(db, user, cv_path)
+        cv_result = await process_cv_for_user(db, user, cv_path, store_batch)
         
         result["cv_processed"] = True
         result["timing_ms"] = cv_result["total_time_ms"]
@@ -237,6 +241,8 @@ async def process_candidate(db: Session, candidate_data: dict, index: int, total
         db.rollback()
         result["error"] = str(e)
         print(f"  ❌ Error: {e}")
+    finally:
+        db.close()
     
     return result
 
@@ -254,12 +260,14 @@ async def main():
     # Get database session
     db = next(get_db())
     
-    results = []
     total_start = time.time()
     
-    for i, candidate in enumerate(CANDIDATES, 1):
-        result = await process_candidate(db, candidate, i, len(CANDIDATES))
-        results.append(result)
+    # Process all candidates concurrently so their CVs are stored in batched upserts
+    async with StoreBatch(CyborgDBService()) as store_batch:
+        results = await asyncio.gather(*(
+            process_candidate(candidate, i, len(CANDIDATES), store_batch)
+            for i, candidate in enumerate(CANDIDATES, 1)
+        ))
     
     total_time = time.time() - total_start
     
@@ -0,0 +1,64 @@
+"""Shared pytest fixtures for backend tests."""
+
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+
+# pbkdf2_sha256 iterations used in tests (production default is 29000)
+TEST_PASSWORD_HASH_ROUNDS = 1000
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _fast_password_hashing():
+    """Lower the password hashing cost for the test session."""
+    from app.services.auth import auth_service
+
+    original_context = auth_service.pwd_context
+    auth_service.pwd_context = CryptContext(
+        schemes=["pbkdf2_sha256"],
+        deprecated="auto",
+        pbkdf2_sha256__rounds=TEST_PASSWORD_HASH_ROUNDS
+    )
+    yield
+    auth_service.pwd_context = original_context
+
+
+@pytest.fixture(scope="session")
+def sqlite_engine():
+    """In-memory SQLite engine with the full schema, created once per session."""
+    from app.database import Base
+    
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        """Let SQLAlchemy emit BEGIN itself so SAVEPOINTs nest correctly."""
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        """Start the SQLite transaction explicitly."""
+        conn.exec_driver_sql("BEGIN")
+    
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_session(sqlite_engine):
+    """Session whose commits land in a SAVEPOINT rolled back after the test."""
+    connection = sqlite_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
@@ -1,11 +1,69 @@
 """Tests for CV processing functionality."""
 
+import asyncio
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, AsyncMock, patch
 from fastapi import UploadFile
 import io
 
-from app.services.cv_processor import CVProcessorService
+from sqlalchemy import event
+
+from app.models.database import CVVectorDB
+from app.services import cv_processor
+from app.services.cv_processor import CVProcessorService, HASH_BYTES
+from app.services.cyborgdb_service import StoreBatch
+
+
+# Real instance used as the mock spec so instance attributes (filename, size) are allowed
+_UPLOAD_FILE_SPEC = UploadFile(file=io.BytesIO(), filename="spec.pdf", size=0)
+
+
+def _mk_upload(filename: str, content_type: str, size: int) -> Mock:
+    """Build a mock UploadFile restricted to the real UploadFile attributes."""
+    mock_file = Mock(spec_set=_UPLOAD_FILE_SPEC)
+    mock_file.filename = filename
+    mock_file.content_type = content_type
+    mock_file.size = size
+    return mock_file
+
+
+class _StubPdfDocument:
+    """Single-page stand-in for a PyMuPDF document; set ``text`` per test."""
+    
+    text = ""
+    
+    def __init__(self, stream=None, filetype=None):
+        self.page_count = 1
+        self._pages = [SimpleNamespace(get_text=lambda *args: _StubPdfDocument.text)]
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def __iter__(self):
+        return iter(self._pages)
+
+
+@pytest.fixture
+def commit_counter(sqlite_engine):
+    """Count session commits on the test engine (each releases the test SAVEPOINT)."""
+    commits = []
+    
+    def _on_commit(conn, name, context):
+        commits.append(name)
+    
+    event.listen(sqlite_engine, "release_savepoint", _on_commit)
+    yield commits
+    event.remove(sqlite_engine, "release_savepoint", _on_commit)
+
+
+@pytest.fixture(scope="module")
+def valid_pdf_upload():
+    """Shared valid PDF upload for tests that do not mutate the file."""
+    return _mk_upload("test.pdf", "application/pdf", 1024 * 1024)  # 1MB
 
 
 class TestCVProcessorService:
@@ -14,26 +72,18 @@ class TestCVProcessorService:
     def setup_method(self):
         """Set up test fixtures."""
         self.cv_processor = CVProcessorService()
+        CVProcessorService._text_cache.clear()
 
-    def test_validate_file_valid_pdf(self):
+    def test_validate_file_valid_pdf(self, valid_pdf_upload):
         """Test file validation with valid PDF."""
-        # Create mock UploadFile
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.pdf"
-        mock_file.content_type = "application/pdf"
-        mock_file.size = 1024 * 1024  # 1MB
-        
         # Should not raise exception
-        CVProcessorService.validate_file(mock_file)
+        CVProcessorService.validate_file(valid_pdf_upload)
 
     def test_validate_file_invalid_extension(self):
         """Test file validation with invalid extension."""
         from fastapi import HTTPException
         
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.txt"
-        mock_file.content_type = "text/plain"
-        mock_file.size = 1024
+        mock_file = _mk_upload("test.txt", "text/plain", 1024)
         
         with pytest.raises(HTTPException) as exc_info:
             CVProcessorService.validate_file(mock_file)
@@ -45,10 +95,7 @@ class TestCVProcessorService:
         """Test file validation with oversized file."""
         from fastapi import HTTPException
         
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.pdf"
-        mock_file.content_type = "application/pdf"
-        mock_file.size = 20 * 1024 * 1024  # 20MB (over 10MB limit)
+        mock_file = _mk_upload("test.pdf", "application/pdf", 20 * 1024 * 1024)  # 20MB (over 10MB limit)
         
         with pytest.raises(HTTPException) as exc_info:
             CVProcessorService.validate_file(mock_file)
@@ -57,23 +104,19 @@ class TestCVProcessorService:
         assert "exceeds maximum limit" in str(exc_info.value.detail)
 
     @pytest.mark.asyncio
-    async def test_extract_text_from_pdf_success(self):
+    async def test_extract_text_from_pdf_success(self, monkeypatch):
         """Test successful PDF text extraction."""
         # Create a simple PDF content (mock)
         pdf_content = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n"
         
-        with patch('app.services.cv_processor.PyPDF2.PdfReader') as mock_reader:
-            # Mock PDF reader
-            mock_page = Mock()
-            mock_page.extract_text.return_value = "This is a test CV with experience in software development."
-            
-            mock_pdf = Mock()
-            mock_pdf.pages = [mock_page]
-            mock_reader.return_value = mock_pdf
-            
-            result = await CVProcessorService.extract_text_from_pdf(pdf_content)
-            
-            assert result == "This is a test CV with experience in software development."
+        monkeypatch.setattr(cv_processor, "fitz", SimpleNamespace(open=_StubPdfDocument))
+        monkeypatch.setattr(
+            _StubPdfDocument, "text", "This is a test CV with experience in software development."
+        )
+        
+        result = await CVProcessorService.extract_text_from_pdf(pdf_content)
+        
+        assert result == "This is a test CV with experience in software development."
 
     @pytest.mark.asyncio
     async def test_extract_text_from_docx_success(self):
@@ -98,11 +141,8 @@ class TestCVProcessorService:
     async def test_extract_text_success(self):
         """Test complete text extraction workflow."""
         # Create mock file
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.pdf"
-        mock_file.content_type = "application/pdf"
-        mock_file.size = 1024
-        mock_file.read = AsyncMock(return_value=b"mock pdf content")
+        mock_file = _mk_upload("test.pdf", "application/pdf", 1024)
+        mock_file.file = io.BytesIO(b"mock pdf content")
         mock_file.seek = AsyncMock()
         
         with patch.object(CVProcessorService, 'extract_text_from_pdf') as mock_extract:
@@ -111,19 +151,38 @@ class TestCVProcessorService:
             text, file_hash = await CVProcessorService.extract_text(mock_file)
             
             assert len(text) > 50  # Should pass minimum length validation
-            assert file_hash is not None
-            assert len(file_hash) == 64  # SHA256 hash length
+            assert isinstance(file_hash, bytes)
+            assert len(file_hash) == HASH_BYTES  # Raw SHA256 digest length
+
+    @pytest.mark.asyncio
+    async def test_extract_text_cache_keyed_by_extension(self):
+        """Test cached text for a PDF is not returned for the same bytes uploaded as DOC."""
+        from fastapi import HTTPException
+        
+        pdf_file = _mk_upload("test.pdf", "application/pdf", 1024)
+        pdf_file.file = io.BytesIO(b"mock cv content")
+        pdf_file.seek = AsyncMock()
+        doc_file = _mk_upload("test.doc", "application/msword", 1024)
+        doc_file.file = io.BytesIO(b"mock cv content")
+        doc_file.seek = AsyncMock()
+        
+        with patch.object(CVProcessorService, 'extract_text_from_pdf') as mock_extract:
+            mock_extract.return_value = "This is a test CV with experience in software development and project management skills."
+            await CVProcessorService.extract_text(pdf_file)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await CVProcessorService.extract_text(doc_file)
+        
+        assert exc_info.value.status_code == 400
+        assert "DOC file format not fully supported" in str(exc_info.value.detail)
 
     @pytest.mark.asyncio
     async def test_extract_text_too_short(self):
         """Test text extraction with content too short."""
         from fastapi import HTTPException
         
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.pdf"
-        mock_file.content_type = "application/pdf"
-        mock_file.size = 1024
-        mock_file.read = AsyncMock(return_value=b"mock pdf content")
+        mock_file = _mk_upload("test.pdf", "application/pdf", 1024)
+        mock_file.file = io.BytesIO(b"mock pdf content")
         mock_file.seek = AsyncMock()
         
         with patch.object(CVProcessorService, 'extract_text_from_pdf') as mock_extract:
@@ -136,35 +195,142 @@ class TestCVProcessorService:
             assert "too short" in str(exc_info.value.detail)
 
     @pytest.mark.asyncio
-    async def test_process_cv_complete_success(self):
+    async def test_process_cv_complete_success(self, valid_pdf_upload, sqlite_session, commit_counter):
         """Test complete CV processing pipeline."""
-        from sqlalchemy.orm import Session
-        
-        # Mock dependencies
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.pdf"
-        
-        mock_db = Mock(spec=Session)
-        mock_db.add = Mock()
-        mock_db.commit = Mock()
-        
         candidate_id = "test-candidate-123"
         
         # Mock the extract_text method
         with patch.object(self.cv_processor, 'extract_text') as mock_extract:
-            mock_extract.return_value = ("This is a comprehensive CV with extensive experience in software development.", "abc123hash")
+            mock_extract.return_value = ("This is a comprehensive CV with extensive experience in software development.", b"abc123hash")
             
             # Mock CyborgDB service
             with patch.object(self.cv_processor.cyborgdb_service, 'store_vector') as mock_store:
                 mock_store.return_value = candidate_id
                 
                 result = await self.cv_processor.process_cv_complete(
-                    file=mock_file,
+                    file=valid_pdf_upload,
                     candidate_id=candidate_id,
-                    db=mock_db
+                    db=sqlite_session
                 )
                 
                 assert result == candidate_id
+                mock_store.assert_awaited_once()
+                
+                # One row through the real ORM path, written in a single transaction
+                assert sqlite_session.query(CVVectorDB).count() == 1
+                stored = sqlite_session.query(CVVectorDB).one()
+                assert stored.cyborgdb_vector_id == candidate_id
+                assert stored.file_hash == b"abc123hash"
+                assert len(commit_counter) == 1
+
+    @pytest.mark.asyncio
+    async def test_process_cv_complete_store_failure_rolls_back(self, valid_pdf_upload):
+        """Test a failed CyborgDB store rolls back the flushed metadata row."""
+        from fastapi import HTTPException
+        from sqlalchemy.orm import Session
+        
+        mock_db = Mock(spec=Session)
+        mock_db.query.return_value.filter.return_value.first.return_value = None
+        
+        with patch.object(self.cv_processor, 'extract_text') as mock_extract:
+            mock_extract.return_value = ("This is a comprehensive CV with extensive experience in software development.", b"abc123hash")
+            
+            with patch.object(self.cv_processor.cyborgdb_service, 'store_vector') as mock_store:
+                mock_store.side_effect = RuntimeError("CV storage failed")
+                
+                with pytest.raises(HTTPException) as exc_info:
+                    await self.cv_processor.process_cv_complete(
+                        file=valid_pdf_upload,
+                        candidate_id="test-candidate-123",
+                        db=mock_db
+                    )
+        
+        assert exc_info.value.status_code == 500
+        mock_db.flush.assert_called_once()
+        mock_db.commit.assert_not_called()
+        mock_db.rollback.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_process_cv_complete_duplicate_upload_skips_store(self, valid_pdf_upload):
+        """Test re-uploading an identical CV does not store it in CyborgDB again."""
+        from sqlalchemy.orm import Session
+        
+        # Return the record added by the first upload on subsequent lookups
+        stored_records = []
+        mock_db = Mock(spec=Session)
+        mock_db.add = Mock(side_effect=stored_records.append)
+        mock_db.commit = Mock()
+        mock_db.query.return_value.filter.return_value.first.side_effect = (
+            lambda: stored_records[0] if stored_records else None
+        )
+        
+        candidate_id = "test-candidate-123"
+        
+        with patch.object(self.cv_processor, 'extract_text') as mock_extract:
+            mock_extract.return_value = ("This is a comprehensive CV with extensive experience in software development.", b"abc123hash")
+            
+            with patch.object(self.cv_processor.cyborgdb_service, 'store_vector') as mock_store:
+                mock_store.return_value = candidate_id
+                
+                for _ in range(2):
+                    result = await self.cv_processor.process_cv_complete(
+                        file=valid_pdf_upload,
+                        candidate_id=candidate_id,
+                        db=mock_db
+                    )
+                    assert result == candidate_id
+                
+                mock_store.assert_called_once()
                 mock_db.add.assert_called_once()
-                mock_db.commit.assert_called_once()
-                mock_store.assert_called_once()
\ No newline at end of file
+                assert mock_db.commit.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_process_cv_complete_concurrent_uploads_batched(self, valid_pdf_upload):
+        """Test concurrent CV uploads sharing a StoreBatch are stored with a single upsert."""
+        from sqlalchemy.orm import Session
+        
+        mock_db = Mock(spec=Session)
+        mock_db.query.return_value.filter.return_value.first.return_value = None
+        
+        mock_index = Mock()
+        candidate_ids = [f"test-candidate-{i}" for i in range(4)]
+        cyborgdb_service = self.cv_processor.cyborgdb_service
+        
+        with patch.object(self.cv_processor, 'extract_text') as mock_extract, \
+                patch.object(cyborgdb_service, '_get_or_create_index', AsyncMock(return_value=mock_index)):
+            mock_extract.side_effect = [
+                ("This is a comprehensive CV with extensive experience in software development.", f"hash{i}".encode())
+                for i in range(4)
+            ]
+            
+            async with StoreBatch(cyborgdb_service) as store_batch:
+                results = await asyncio.gather(*(
+                    self.cv_processor.process_cv_complete(
+                        file=valid_pdf_upload,
+                        candidate_id=candidate_id,
+                        db=mock_db,
+                        store_batch=store_batch
+                    )
+                    for candidate_id in candidate_ids
+                ))
+        
+        assert results == candidate_ids
+        mock_index.upsert.assert_called_once()
+        upserted_items = mock_index.upsert.call_args[0][0]
+        assert [item["id"] for item in upserted_items] == candidate_ids
+    
+    @pytest.mark.asyncio
+    async def test_store_batch_failure_reaches_every_store(self):
+        """Test a failed batched upsert is raised to each waiting store."""
+        cyborgdb_service = self.cv_processor.cyborgdb_service
+        
+        with patch.object(cyborgdb_service, 'store_vectors', AsyncMock(side_effect=RuntimeError("CV storage failed"))) as mock_store:
+            async with StoreBatch(cyborgdb_service) as store_batch:
+                results = await asyncio.gather(
+                    store_batch.store_vector("CV text 0", "test-candidate-0"),
+                    store_batch.store_vector("CV text 1", "test-candidate-1"),
+                    return_exceptions=True
+                )
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+        mock_store.assert_awaited_once()
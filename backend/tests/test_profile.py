@@ -2,7 +2,6 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from unittest.mock import AsyncMock, patch, MagicMock
 import tempfile
@@ -10,19 +9,14 @@ import io
 from datetime import datetime
 
 from main import app
-from app.database import get_db, Base
+from app.database import get_db
 from app.models.database import UserDB, CVVectorDB
 from app.models.user import UserRole, CVProcessingStatus
 from app.services.auth import auth_service
 
 
-# Create test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_profile.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Sessions for the app under test; bound to the shared test engine by _test_database
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 
 def override_get_db():
@@ -34,70 +28,117 @@ def override_get_db():
         db.close()
 
 
-app.dependency_overrides[get_db] = override_get_db
 client = TestClient(app)
 
 
+@pytest.fixture(scope="module", autouse=True)
+def _test_database(sqlite_engine):
+    """Serve the app's database dependency from the shared test engine for this module."""
+    TestingSessionLocal.configure(bind=sqlite_engine)
+    previous_override = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield sqlite_engine
+    if previous_override is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous_override
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _stub_password_hashing():
+    """Replace password hashing with a cheap stub; hashing is covered in test_auth.py."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(auth_service, "get_password_hash", lambda password: f"stub${password}")
+        mp.setattr(
+            auth_service,
+            "verify_password",
+            lambda password, hashed: hashed == f"stub${password}"
+        )
+        yield
+
+
+def _get_auth_token(email: str, password: str) -> str:
+    """Get authentication token for user."""
+    response = client.post("/auth/login", json={
+        "email": email,
+        "password": password
+    })
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded_users(_test_database, _stub_password_hashing):
+    """Create the test candidate and recruiter once for the module."""
+    db = TestingSessionLocal()
+    
+    # Test candidate
+    db.add(UserDB(
+        id="test-candidate-123",
+        email="candidate@test.com",
+        password_hash=auth_service.get_password_hash("testpass123"),
+        role=UserRole.CANDIDATE,
+        first_name="John",
+        last_name="Doe",
+        is_active=True,
+        cv_processing_status=CVProcessingStatus.COMPLETED,
+        vector_id="test-vector-123"
+    ))
+    
+    # Test recruiter
+    db.add(UserDB(
+        id="test-recruiter-123",
+        email="recruiter@test.com",
+        password_hash=auth_service.get_password_hash("testpass123"),
+        role=UserRole.RECRUITER,
+        company_name="Test Company",
+        job_title="HR Manager",
+        is_active=True
+    ))
+    db.commit()
+    db.close()
+    yield
+    
+    # Clear database
+    db = TestingSessionLocal()
+    db.query(CVVectorDB).delete()
+    db.query(UserDB).delete()
+    db.commit()
+    db.close()
+
+
+@pytest.fixture(scope="module")
+def candidate_token(seeded_users):
+    """Log the test candidate in once per module."""
+    return _get_auth_token("candidate@test.com", "testpass123")
+
+
+@pytest.fixture(scope="module")
+def recruiter_token(seeded_users):
+    """Log the test recruiter in once per module."""
+    return _get_auth_token("recruiter@test.com", "testpass123")
+
+
 class TestProfileManagement:
     """Test profile management functionality."""
     
-    def setup_method(self):
-        """Set up test data before each test."""
-        # Clear database
-        db = TestingSessionLocal()
-        db.query(CVVectorDB).delete()
-        db.query(UserDB).delete()
-        db.commit()
-        
-        # Create test candidate
-        self.candidate_data = {
-            "id": "test-candidate-123",
-            "email": "candidate@test.com",
-            "password_hash": auth_service.get_password_hash("testpass123"),
-            "role": UserRole.CANDIDATE,
-            "first_name": "John",
-            "last_name": "Doe",
-            "is_active": True,
-            "cv_processing_status": CVProcessingStatus.COMPLETED,
-            "vector_id": "test-vector-123"
-        }
-        
-        candidate = UserDB(**self.candidate_data)
-        db.add(candidate)
-        db.commit()
-        
-        # Create test recruiter
-        self.recruiter_data = {
-            "id": "test-recruiter-123",
-            "email": "recruiter@test.com",
-            "password_hash": auth_service.get_password_hash("testpass123"),
-            "role": UserRole.RECRUITER,
-            "company_name": "Test Company",
-            "job_title": "HR Manager",
-            "is_active": True
-        }
-        
-        recruiter = UserDB(**self.recruiter_data)
-        db.add(recruiter)
-        db.commit()
-        db.close()
-        
-        # Get authentication tokens
-        self.candidate_token = self._get_auth_token("candidate@test.com", "testpass123")
-        self.recruiter_token = self._get_auth_token("recruiter@test.com", "testpass123")
-    
-    def _get_auth_token(self, email: str, password: str) -> str:
-        """Get authentication token for user."""
-        response = client.post("/auth/login", json={
-            "email": email,
-            "password": password
-        })
-        assert response.status_code == 200
-        return response.json()["access_token"]
+    @pytest.fixture(autouse=True)
+    def _rollback_transaction(self, sqlite_engine):
+        """Run each test inside a transaction that is rolled back afterwards."""
+        connection = sqlite_engine.connect()
+        transaction = connection.begin()
+        
+        # Session commits release a SAVEPOINT instead of the outer transaction
+        TestingSessionLocal.configure(bind=connection, join_transaction_mode="create_savepoint")
+        yield
+        
+        TestingSessionLocal.configure(bind=sqlite_engine)
+        transaction.rollback()
+        connection.close()
     
-    def test_get_candidate_profile_success(self):
+    def test_get_candidate_profile_success(self, candidate_token):
         """Test successful candidate profile retrieval."""
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         
         response = client.get("/profile/me", headers=headers)
         
@@ -114,18 +155,18 @@ class TestProfileManagement:
         response = client.get("/profile/me")
         assert response.status_code == 403
     
-    def test_get_candidate_profile_wrong_role(self):
+    def test_get_candidate_profile_wrong_role(self, recruiter_token):
         """Test candidate profile retrieval with recruiter token."""
-        headers = {"Authorization": f"Bearer {self.recruiter_token}"}
+        headers = {"Authorization": f"Bearer {recruiter_token}"}
         
         response = client.get("/profile/me", headers=headers)
         
         assert response.status_code == 403
         assert "Only candidates can access candidate profiles" in response.json()["detail"]
     
-    def test_update_candidate_profile_success(self):
+    def test_update_candidate_profile_success(self, candidate_token):
         """Test successful candidate profile update."""
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         update_data = {
             "first_name": "Jane",
             "last_name": "Smith"
@@ -139,9 +180,9 @@ class TestProfileManagement:
         assert data["last_name"] == "Smith"
         assert data["email"] == "candidate@test.com"  # Unchanged
     
-    def test_update_candidate_profile_partial(self):
+    def test_update_candidate_profile_partial(self, candidate_token):
         """Test partial candidate profile update."""
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         update_data = {
             "first_name": "Jane"
             # last_name not provided
@@ -154,9 +195,9 @@ class TestProfileManagement:
         assert data["first_name"] == "Jane"
         assert data["last_name"] == "Doe"  # Unchanged
     
-    def test_update_candidate_profile_wrong_role(self):
+    def test_update_candidate_profile_wrong_role(self, recruiter_token):
         """Test candidate profile update with recruiter token."""
-        headers = {"Authorization": f"Bearer {self.recruiter_token}"}
+        headers = {"Authorization": f"Bearer {recruiter_token}"}
         update_data = {"first_name": "Jane"}
         
         response = client.put("/profile/me", headers=headers, json=update_data)
@@ -166,12 +207,12 @@ class TestProfileManagement:
     
     @patch('app.services.upload_queue.upload_queue_manager.is_user_processing')
     @patch('app.services.upload_queue.upload_queue_manager.queue_upload')
-    def test_replace_cv_success(self, mock_queue_upload, mock_is_processing):
+    def test_replace_cv_success(self, mock_queue_upload, mock_is_processing, candidate_token):
         """Test successful CV replacement."""
         mock_is_processing.return_value = False
         mock_queue_upload.return_value = "test-task-123"
         
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         
         # Create a test file
         test_file_content = b"Test CV content for replacement"
@@ -185,15 +226,35 @@ class TestProfileManagement:
         assert data["processing_status"] == "pending"
         assert data["task_id"] == "test-task-123"
         
-        # Verify queue_upload was called
+        # Verify queue_upload was called with a spooled file, not raw bytes
         mock_queue_upload.assert_called_once()
+        queued_file = mock_queue_upload.call_args.kwargs["file"]
+        assert isinstance(queued_file.file, tempfile.SpooledTemporaryFile)
+        assert queued_file.file.read() == test_file_content
+        assert queued_file.filename == "test_cv.pdf"
+    
+    @patch('app.services.upload_queue.upload_queue_manager.is_user_processing')
+    @patch('app.services.upload_queue.upload_queue_manager.queue_upload')
+    def test_replace_cv_queue_failure_closes_spool(self, mock_queue_upload, mock_is_processing, candidate_token):
+        """Test the spooled copy is closed when the replacement cannot be queued."""
+        mock_is_processing.return_value = False
+        mock_queue_upload.side_effect = RuntimeError("queue unavailable")
+        
+        headers = {"Authorization": f"Bearer {candidate_token}"}
+        files = {"file": ("test_cv.pdf", io.BytesIO(b"Test CV content"), "application/pdf")}
+        
+        response = client.post("/profile/cv/replace", headers=headers, files=files)
+        
+        assert response.status_code == 500
+        queued_file = mock_queue_upload.call_args.kwargs["file"]
+        assert queued_file.file.closed
     
     @patch('app.services.upload_queue.upload_queue_manager.is_user_processing')
-    def test_replace_cv_concurrent_upload(self, mock_is_processing):
+    def test_replace_cv_concurrent_upload(self, mock_is_processing, candidate_token):
         """Test CV replacement with concurrent upload."""
         mock_is_processing.return_value = True
         
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         
         # Create a test file
         test_file_content = b"Test CV content"
@@ -204,9 +265,9 @@ class TestProfileManagement:
         assert response.status_code == 409
         assert "Another CV upload is currently being processed" in response.json()["detail"]
     
-    def test_replace_cv_wrong_role(self):
+    def test_replace_cv_wrong_role(self, recruiter_token):
         """Test CV replacement with recruiter token."""
-        headers = {"Authorization": f"Bearer {self.recruiter_token}"}
+        headers = {"Authorization": f"Bearer {recruiter_token}"}
         
         test_file_content = b"Test CV content"
         files = {"file": ("test_cv.pdf", io.BytesIO(test_file_content), "application/pdf")}
@@ -217,11 +278,11 @@ class TestProfileManagement:
         assert "Only candidates can replace CVs" in response.json()["detail"]
     
     @patch('app.services.cyborgdb_service.CyborgDBService.delete_vector')
-    def test_delete_candidate_profile_success(self, mock_delete_vector):
+    def test_delete_candidate_profile_success(self, mock_delete_vector, candidate_token):
         """Test successful candidate profile deletion."""
         mock_delete_vector.return_value = True
         
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         
         response = client.delete("/profile/me", headers=headers)
         
@@ -236,18 +297,18 @@ class TestProfileManagement:
         assert user is None
         db.close()
     
-    def test_delete_candidate_profile_wrong_role(self):
+    def test_delete_candidate_profile_wrong_role(self, recruiter_token):
         """Test candidate profile deletion with recruiter token."""
-        headers = {"Authorization": f"Bearer {self.recruiter_token}"}
+        headers = {"Authorization": f"Bearer {recruiter_token}"}
         
         response = client.delete("/profile/me", headers=headers)
         
         assert response.status_code == 403
         assert "Only candidates can delete candidate profiles" in response.json()["detail"]
     
-    def test_get_notifications_success(self):
+    def test_get_notifications_success(self, candidate_token):
         """Test getting user notifications."""
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         
         response = client.get("/profile/notifications", headers=headers)
         
@@ -255,9 +316,9 @@ class TestProfileManagement:
         data = response.json()
         assert isinstance(data, list)
     
-    def test_get_notifications_with_filters(self):
+    def test_get_notifications_with_filters(self, candidate_token):
         """Test getting user notifications with filters."""
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         
         response = client.get("/profile/notifications?unread_only=true&limit=5", headers=headers)
         
@@ -265,9 +326,9 @@ class TestProfileManagement:
         data = response.json()
         assert isinstance(data, list)
     
-    def test_get_upload_status_success(self):
+    def test_get_upload_status_success(self, candidate_token):
         """Test getting upload status."""
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         
         response = client.get("/profile/uploads", headers=headers)
         
@@ -275,9 +336,9 @@ class TestProfileManagement:
         data = response.json()
         assert isinstance(data, list)
     
-    def test_get_upload_status_wrong_role(self):
+    def test_get_upload_status_wrong_role(self, recruiter_token):
         """Test getting upload status with recruiter token."""
-        headers = {"Authorization": f"Bearer {self.recruiter_token}"}
+        headers = {"Authorization": f"Bearer {recruiter_token}"}
         
         response = client.get("/profile/uploads", headers=headers)
         
@@ -285,7 +346,7 @@ class TestProfileManagement:
         assert "Only candidates can view upload status" in response.json()["detail"]
     
     @patch('app.services.upload_queue.upload_queue_manager.get_upload_status')
-    def test_get_specific_upload_status_success(self, mock_get_status):
+    def test_get_specific_upload_status_success(self, mock_get_status, candidate_token):
         """Test getting specific upload status."""
         from app.services.upload_queue import UploadTask, UploadStatus
         
@@ -298,7 +359,7 @@ class TestProfileManagement:
         )
         mock_get_status.return_value = mock_task
         
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         
         response = client.get("/profile/uploads/test-task-123", headers=headers)
         
@@ -309,22 +370,13 @@ class TestProfileManagement:
         assert data["filename"] == "test.pdf"
     
     @patch('app.services.upload_queue.upload_queue_manager.get_upload_status')
-    def test_get_specific_upload_status_not_found(self, mock_get_status):
+    def test_get_specific_upload_status_not_found(self, mock_get_status, candidate_token):
         """Test getting specific upload status for non-existent task."""
         mock_get_status.return_value = None
         
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        headers = {"Authorization": f"Bearer {candidate_token}"}
         
         response = client.get("/profile/uploads/nonexistent-task", headers=headers)
         
         assert response.status_code == 404
         assert "Upload task not found" in response.json()["detail"]
-    
-    def teardown_method(self):
-        """Clean up after each test."""
-        # Clear database
-        db = TestingSessionLocal()
-        db.query(CVVectorDB).delete()
-        db.query(UserDB).delete()
-        db.commit()
-        db.close()
\ No newline at end of file
@@ -4,19 +4,18 @@ import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from fastapi.testclient import TestClient
 from fastapi import HTTPException
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 
 from app.services.search_service import SearchService
 from app.services.saved_search_service import SavedSearchService
-from app.services.advanced_search_service import AdvancedSearchService, SearchCache
+from app.services.advanced_search_service import AdvancedSearchService, RawSearchResult, SearchCache, SearchHistory
 from app.api.search import router
 from app.models.search import (
     SearchRequest, SearchResult, SavedSearchCreateRequest, SavedSearchUpdateRequest,
     SearchExportRequest, ExportFormat, SearchResponse
 )
-from app.models.database import Base, SavedSearchDB
+from app.models.database import SavedSearchDB
 from main import app
 
 client = TestClient(app)
@@ -83,6 +82,22 @@ class TestSearchService:
                 limit=150
             )
     
+    def test_validate_search_parameters_batch(self):
+        """Test batch validation reports each failure without raising."""
+        results = self.search_service.validate_search_parameters_batch([
+            {"requirements_text": "Python developer with experience", "limit": 20},
+            {"requirements_text": "Python developer", "limit": 0},
+            {"requirements_text": "   "}
+        ])
+        
+        assert results[0] == (True, None, {
+            "requirements_text": "Python developer with experience",
+            "limit": 20,
+            "filters": {}
+        })
+        assert results[1] == (False, "Limit must be a positive integer", None)
+        assert results[2] == (False, "Job requirements cannot be empty", None)
+    
     def test_rank_search_results(self):
         """Test ranking of search results."""
         results = [
@@ -100,6 +115,19 @@ class TestSearchService:
         assert ranked[1]["candidate_id"] == "1"
         assert ranked[2]["candidate_id"] == "3"
     
+    def test_rank_search_results_top_k(self):
+        """Test ranking only the best top_k results."""
+        results = [
+            {"candidate_id": str(i), "similarity_score": score}
+            for i, score in enumerate([0.2, 0.9, 0.5, 0.95, 0.7, 0.1])
+        ]
+        
+        ranked = self.search_service.rank_search_results(results, top_k=3)
+        
+        assert [r["candidate_id"] for r in ranked] == ["3", "1", "4"]
+        assert [r["rank"] for r in ranked] == [1, 2, 3]
+        assert [r["score_tier"] for r in ranked] == ["excellent", "excellent", "good"]
+    
     def test_rank_search_results_empty(self):
         """Test ranking of empty results."""
         result = self.search_service.rank_search_results([])
@@ -126,6 +154,22 @@ class TestSearchService:
         assert len(filtered) == 2
         assert all(r["similarity_score"] >= 0.6 for r in filtered)
     
+    def test_filter_search_results_min_score_sorted(self):
+        """Test minimum score filtering on results already ranked by score."""
+        results = self.search_service.rank_search_results([
+            {"candidate_id": "1", "similarity_score": 0.7},
+            {"candidate_id": "2", "similarity_score": 0.9},
+            {"candidate_id": "3", "similarity_score": 0.3},
+            {"candidate_id": "4", "similarity_score": 0.6}
+        ])
+        filters = {"min_similarity_score": 0.6}
+        
+        filtered = self.search_service.filter_search_results(
+            results, filters, results_sorted_desc=True
+        )
+        
+        assert [r["candidate_id"] for r in filtered] == ["2", "1", "4"]
+    
     def test_filter_search_results_max_results(self):
         """Test filtering by maximum results."""
         results = [
@@ -193,6 +237,33 @@ class TestSearchService:
         assert result["results"][0]["candidate_id"] == "1"
         assert result["results"][0]["similarity_score"] == 0.8
     
+    @pytest.mark.asyncio
+    @patch('app.services.search_service.CyborgDBService')
+    async def test_search_candidates_single_query_min_score(self, mock_cyborgdb_service):
+        """Test that a large search issues one CyborgDB query and drops hits below the cutoff."""
+        mock_cyborgdb_instance = AsyncMock()
+        mock_cyborgdb_instance.search_similar_vectors.return_value = [
+            {"candidate_id": str(i), "similarity_score": 0.951 - i * 0.005, "metadata": {}}
+            for i in range(100)
+        ]
+        mock_cyborgdb_service.return_value = mock_cyborgdb_instance
+        
+        mock_db = Mock()
+        mock_db.query.return_value.filter.return_value.all.return_value = []
+        
+        search_service = SearchService()
+        result = await search_service.search_candidates(
+            requirements_text="Python developer with Django experience",
+            db=mock_db,
+            limit=100,
+            filters={"min_similarity_score": 0.7}
+        )
+        
+        mock_cyborgdb_instance.search_similar_vectors.assert_awaited_once()
+        assert mock_cyborgdb_instance.search_similar_vectors.await_args.kwargs["limit"] == 100
+        assert len(result["results"]) == 51
+        assert all(r["similarity_score"] >= 0.7 for r in result["results"])
+    
     @pytest.mark.asyncio
     async def test_search_candidates_invalid_requirements(self):
         """Test search with invalid requirements."""
@@ -208,15 +279,10 @@ class TestSearchService:
 class TestSavedSearchService:
     """Test cases for SavedSearchService."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        # Create in-memory SQLite database for testing
-        self.engine = create_engine("sqlite:///:memory:")
-        Base.metadata.create_all(self.engine)
-        
-        # Create session
-        SessionLocal = sessionmaker(bind=self.engine)
-        self.db = SessionLocal()
+    @pytest.fixture(autouse=True)
+    def _setup(self, sqlite_session):
+        """Set up test fixtures on the shared schema; changes roll back after each test."""
+        self.db = sqlite_session
         
         # Initialize service
         self.saved_search_service = SavedSearchService(self.db)
@@ -229,9 +295,16 @@ class TestSavedSearchService:
             limit=20
         )
     
-    def teardown_method(self):
-        """Clean up after tests."""
-        self.db.close()
+    def _create_saved_searches(self, count: int):
+        """Create ``count`` saved searches named 'Search 0'.. in one transaction."""
+        requests = [
+            SavedSearchCreateRequest(name=f"Search {i}", criteria=self.search_criteria)
+            for i in range(count)
+        ]
+        return self.saved_search_service.create_saved_searches_bulk(
+            recruiter_id=self.recruiter_id,
+            requests=requests
+        )
     
     def test_create_saved_search_success(self):
         """Test successful creation of saved search."""
@@ -272,6 +345,43 @@ class TestSavedSearchService:
                 request=request
             )
     
+    def test_create_saved_search_other_integrity_error(self):
+        """Test constraint violations other than a duplicate name are not reported as duplicates."""
+        request = SavedSearchCreateRequest(
+            name="Python Developers",
+            criteria=self.search_criteria
+        )
+        error = IntegrityError(
+            "INSERT", {}, Exception("NOT NULL constraint failed: saved_searches.requirements")
+        )
+        
+        with patch.object(self.db, 'commit', side_effect=error):
+            with pytest.raises(RuntimeError, match="NOT NULL constraint failed"):
+                self.saved_search_service.create_saved_search(
+                    recruiter_id=self.recruiter_id,
+                    request=request
+                )
+    
+    def test_create_saved_searches_bulk_existing_name(self):
+        """Test bulk creation fails without writing when a name already exists."""
+        self._create_saved_searches(1)
+        
+        with pytest.raises(ValueError, match="Search with name 'Search 0' already exists"):
+            self._create_saved_searches(3)
+        
+        assert self.saved_search_service.get_saved_searches(self.recruiter_id).total_count == 1
+    
+    def test_create_saved_searches_bulk_concurrent_duplicate(self):
+        """Test a duplicate name inserted concurrently after the check is reported as a duplicate."""
+        error = IntegrityError(
+            "INSERT", {},
+            Exception("UNIQUE constraint failed: saved_searches.recruiter_id, saved_searches.name")
+        )
+        
+        with patch.object(self.db, 'commit', side_effect=error):
+            with pytest.raises(ValueError, match="already exists"):
+                self._create_saved_searches(3)
+    
     def test_get_saved_searches_empty(self):
         """Test getting saved searches when none exist."""
         result = self.saved_search_service.get_saved_searches(self.recruiter_id)
@@ -282,15 +392,7 @@ class TestSavedSearchService:
     def test_get_saved_searches_with_data(self):
         """Test getting saved searches with existing data."""
         # Create test searches
-        for i in range(3):
-            request = SavedSearchCreateRequest(
-                name=f"Search {i}",
-                criteria=self.search_criteria
-            )
-            self.saved_search_service.create_saved_search(
-                recruiter_id=self.recruiter_id,
-                request=request
-            )
+        self._create_saved_searches(3)
         
         result = self.saved_search_service.get_saved_searches(self.recruiter_id)
         
@@ -305,15 +407,7 @@ class TestSavedSearchService:
     def test_get_saved_searches_with_pagination(self):
         """Test getting saved searches with pagination."""
         # Create test searches
-        for i in range(5):
-            request = SavedSearchCreateRequest(
-                name=f"Search {i}",
-                criteria=self.search_criteria
-            )
-            self.saved_search_service.create_saved_search(
-                recruiter_id=self.recruiter_id,
-                request=request
-            )
+        self._create_saved_searches(5)
         
         result = self.saved_search_service.get_saved_searches(
             recruiter_id=self.recruiter_id,
@@ -324,6 +418,32 @@ class TestSavedSearchService:
         assert result.total_count == 5
         assert len(result.searches) == 2
     
+    def test_get_saved_searches_with_cursor(self):
+        """Test keyset pagination walks every search exactly once."""
+        self._create_saved_searches(5)
+        
+        first_page = self.saved_search_service.get_saved_searches(
+            recruiter_id=self.recruiter_id,
+            limit=2
+        )
+        second_page = self.saved_search_service.get_saved_searches(
+            recruiter_id=self.recruiter_id,
+            limit=2,
+            cursor=first_page.next_cursor
+        )
+        last_page = self.saved_search_service.get_saved_searches(
+            recruiter_id=self.recruiter_id,
+            limit=2,
+            cursor=second_page.next_cursor
+        )
+        
+        pages = [first_page, second_page, last_page]
+        assert [len(page.searches) for page in pages] == [2, 2, 1]
+        assert last_page.next_cursor is None
+        assert all(page.total_count == 5 for page in pages)
+        names = [search.name for page in pages for search in page.searches]
+        assert sorted(names) == [f"Search {i}" for i in range(5)]
+    
     def test_get_saved_search_exists(self):
         """Test getting a specific saved search that exists."""
         request = SavedSearchCreateRequest(
@@ -345,6 +465,18 @@ class TestSavedSearchService:
         assert result.id == created.id
         assert result.name == "Python Developers"
     
+    def test_get_saved_search_checks_owner(self):
+        """Test a search looked up by primary key is only returned to its owner."""
+        created = self._create_saved_searches(1)[0]
+        
+        result = self.saved_search_service.get_saved_search(
+            recruiter_id=self.recruiter_id,
+            search_id=created.id
+        )
+        
+        assert result.id == created.id
+        assert self.saved_search_service.get_saved_search("other-recruiter", created.id) is None
+    
     def test_get_saved_search_not_exists(self):
         """Test getting a saved search that doesn't exist."""
         result = self.saved_search_service.get_saved_search(
@@ -486,6 +618,22 @@ class TestSavedSearchService:
         assert updated_search.use_count == 1
         assert updated_search.last_used_at is not None
     
+    def test_use_saved_search_increments_count(self):
+        """Test repeated use increments the stored use count."""
+        created = self._create_saved_searches(1)[0]
+        
+        for _ in range(3):
+            self.saved_search_service.use_saved_search(
+                recruiter_id=self.recruiter_id,
+                search_id=created.id
+            )
+        
+        updated_search = self.saved_search_service.get_saved_search(
+            recruiter_id=self.recruiter_id,
+            search_id=created.id
+        )
+        assert updated_search.use_count == 3
+    
     def test_use_saved_search_not_exists(self):
         """Test using a saved search that doesn't exist."""
         result = self.saved_search_service.use_saved_search(
@@ -616,6 +764,23 @@ class TestAdvancedSearchService:
         stats = cache.get_stats()
         assert stats["total_entries"] == 2
     
+    def test_search_cache_evicts_least_recently_used(self):
+        """Test that a cache hit protects an entry from eviction."""
+        cache = SearchCache(max_size=2)
+        requests = [
+            SearchRequest(requirements=f"Python developer {i}", limit=10)
+            for i in range(3)
+        ]
+        
+        cache.set(requests[0], {"results": ["0"]})
+        cache.set(requests[1], {"results": ["1"]})
+        cache.get(requests[0])  # Entry 0 is now most recently used
+        cache.set(requests[2], {"results": ["2"]})
+        
+        assert cache.get(requests[0]) == {"results": ["0"]}
+        assert cache.get(requests[1]) is None
+        assert cache.get(requests[2]) == {"results": ["2"]}
+    
     def test_extract_keywords(self):
         """Test keyword extraction from requirements text."""
         keywords = self.advanced_search_service._extract_keywords(
@@ -655,6 +820,41 @@ class TestAdvancedSearchService:
         assert self.advanced_search_service.performance_metrics["cache_hits"] == 0
         assert len(self.advanced_search_service.search_history) == 1
     
+    def test_search_history_keeps_most_recent_entries(self):
+        """Test search history retains only the newest max_entries searches."""
+        history = SearchHistory(max_entries=4, initial_capacity=2)
+        
+        for i in range(11):
+            history.append(
+                executed_at=float(i),
+                search_time_ms=10.0,
+                results_count=i,
+                cache_hit=False,
+                recruiter_id="recruiter-a" if i % 2 else "recruiter-b",
+                keywords=[f"keyword{i}"]
+            )
+        
+        assert len(history) == 4
+        selected = history.select(since=0.0)
+        assert history.results_count[selected].tolist() == [7, 8, 9, 10]
+        assert [history.keywords[i] for i in selected] == [["keyword7"], ["keyword8"], ["keyword9"], ["keyword10"]]
+        
+        selected = history.select(since=0.0, recruiter_id="recruiter-a")
+        assert history.results_count[selected].tolist() == [7, 9]
+        assert history.keyword_counts(0.0, 2, "recruiter-a") == {"keyword7": 1, "keyword9": 1}
+        assert history.keyword_counts(0.0, 4) == {
+            "keyword7": 1, "keyword8": 1, "keyword9": 1, "keyword10": 1
+        }
+        assert history.keyword_counts(9.0, 2) == {"keyword9": 1, "keyword10": 1}
+        
+        # Day totals only cover the retained entries
+        summary = history.summarize(since_day=0, until_day=0)
+        assert summary.searches == 4
+        assert summary.total_results == 7 + 8 + 9 + 10
+        assert summary.total_search_time_ms == 40.0
+        assert history.summarize(since_day=0, until_day=0, recruiter_id="recruiter-b").searches == 2
+        assert len(history.select(since=0.0, recruiter_id="unknown")) == 0
+    
     def test_get_search_analytics_empty(self):
         """Test getting analytics with no search history."""
         analytics = self.advanced_search_service.get_search_analytics(
@@ -786,4 +986,25 @@ class TestAdvancedSearchService:
         assert len(data["results"]) == 1
         assert data["results"][0]["candidate_id"] == "1"
         assert "metadata" in data
-        assert data["metadata"]["search_query"] == "Python developer"
\ No newline at end of file
+        assert data["metadata"]["search_query"] == "Python developer"
+    
+    def test_export_raw_results(self):
+        """Test exporting slotted result rows built from search hits."""
+        row = RawSearchResult.from_search_hit({
+            "candidate_id": "1",
+            "similarity_score": 0.8,
+            "metadata": {"skills": ["Python", "Django"], "experience_level": "Senior"}
+        })
+        
+        assert not hasattr(row, "__dict__")
+        assert row.to_search_result().matched_skills == ["Python", "Django"]
+        
+        export_response = self.advanced_search_service.export_raw_results(
+            rows=[row],
+            query_processed="python developer",
+            export_request=SearchExportRequest(format=ExportFormat.JSON),
+            recruiter_id="recruiter1"
+        )
+        
+        assert export_response.total_results == 1
+        assert export_response.format == ExportFormat.JSON
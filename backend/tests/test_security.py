@@ -1,24 +1,80 @@
 """Tests for security middleware and audit logging."""
 
+import asyncio
+import os
+from collections import deque
+import threading
+import time
 import pytest
 import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from httpx import ASGITransport, AsyncClient
+from unittest.mock import patch
 
 from main import app
-from app.services.audit_service import audit_service, AuditEventType
-from app.services.monitoring_service import security_monitor
+from app.middleware.auth import get_current_user
+from app.middleware.security import InputValidationMiddleware
+from app.services.audit_service import (
+    audit_service, AsyncJsonLogger, AuditEventType, BufferPool, SecurityEventType,
+    _write_buffers
+)
+from app.services.monitoring_service import AlertLevel, DASHBOARD_CACHE_TTL_SECONDS, security_monitor
+from app.utils.validation import compile_pattern_union
 
 
-client = TestClient(app)
+@pytest.fixture(scope="module")
+def client():
+    """TestClient shared by every test in this module.
+    
+    The startup hook is not entered, as before, since it needs the configured database.
+    """
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def authed_client(client):
+    """Shared TestClient whose requests authenticate as a stub user."""
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="test-user")
+    yield client
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def _async_client() -> AsyncClient:
+    """HTTP client that drives the app in-process so requests can run concurrently."""
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver")
+
+
+def make_request(path: str, method: str) -> SimpleNamespace:
+    """Static stand-in for a FastAPI Request with the fields audit logging reads."""
+    return SimpleNamespace(
+        url=SimpleNamespace(path=path),
+        method=method,
+        client=SimpleNamespace(host="127.0.0.1"),
+        headers={"User-Agent": "test-agent"}
+    )
+
+
+def _record_failed_logins(ip_address: str, count: int):
+    """Record a burst of failed logins from one IP directly on the security monitor."""
+    for _ in range(count):
+        security_monitor.record_event(
+            event_type="authentication_failure",
+            ip_address=ip_address,
+            user_agent="test-agent",
+            endpoint="/auth/login"
+        )
 
 
 class TestSecurityMiddleware:
     """Test security middleware functionality."""
     
-    def test_security_headers_added(self):
+    @pytest.mark.asyncio
+    async def test_security_headers_added(self):
         """Test that security headers are added to responses."""
-        response = client.get("/")
+        async with _async_client() as async_client:
+            response = await async_client.get("/", headers={"Accept-Encoding": "identity"})
         
         # Check for security headers
         assert "X-Frame-Options" in response.headers
@@ -29,7 +85,17 @@ class TestSecurityMiddleware:
         assert "Content-Security-Policy" in response.headers
         assert "Strict-Transport-Security" in response.headers
     
-    def test_malicious_query_parameter_blocked(self):
+    def test_large_responses_compressed(self, client):
+        """Test that large responses are gzip-compressed for clients that accept it."""
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert "X-Content-Type-Options" in response.headers
+        assert "paths" in response.json()
+    
+    def test_malicious_query_parameter_blocked(self, client):
         """Test that malicious query parameters are blocked."""
         # Test SQL injection attempt
         response = client.get("/?search='; DROP TABLE users; --")
@@ -40,35 +106,61 @@ class TestSecurityMiddleware:
         response = client.get("/?name=<script>alert('xss')</script>")
         assert response.status_code == 400
     
-    def test_path_traversal_blocked(self):
+    def test_path_traversal_blocked(self, client):
         """Test that path traversal attempts are blocked."""
         response = client.get("/../../../etc/passwd")
         assert response.status_code == 400
         assert "Invalid request path" in response.json()["detail"]
     
-    def test_rate_limiting_headers(self):
-        """Test that rate limiting headers are present."""
-        response = client.get("/")
+    @pytest.mark.asyncio
+    async def test_rate_limiting_headers(self):
+        """Test that rate limiting headers are present on concurrent requests."""
+        async with _async_client() as async_client:
+            responses = await asyncio.gather(*(async_client.get("/") for _ in range(3)))
         
         # Check for rate limiting headers
-        assert "X-RateLimit-Limit-Minute" in response.headers
-        assert "X-RateLimit-Remaining-Minute" in response.headers
-        assert "X-RateLimit-Limit-Hour" in response.headers
-        assert "X-RateLimit-Remaining-Hour" in response.headers
+        for response in responses:
+            assert "X-RateLimit-Limit-Minute" in response.headers
+            assert "X-RateLimit-Remaining-Minute" in response.headers
+            assert "X-RateLimit-Limit-Hour" in response.headers
+            assert "X-RateLimit-Remaining-Hour" in response.headers
+
+
+class TestInputPatternScan:
+    """Test combined malicious input pattern detection."""
+    
+    @pytest.mark.parametrize("value, malicious", [
+        ("'; DROP TABLE users; --", True),
+        ("<script>alert('xss')</script>", True),
+        ("%2E%2E%2Fetc/passwd", True),
+        ("1 or 1=1", True),
+        ("python developer", False),
+        ("senior engineer, 5+ years", False),
+    ])
+    def test_is_malicious_input(self, value, malicious):
+        """Test that one scan flags the same inputs as the per-pattern checks."""
+        middleware = InputValidationMiddleware(app)
+        
+        assert middleware._is_malicious_input(value) is malicious
+        assert any(
+            compile_pattern_union(tuple(patterns)).search(value) is not None
+            for patterns in (
+                middleware.sql_injection_patterns,
+                middleware.xss_patterns,
+                middleware.path_traversal_patterns
+            )
+        ) is malicious
 
 
 class TestAuditService:
     """Test audit logging functionality."""
     
-    @patch('app.services.audit_service.audit_logger')
-    def test_audit_event_logging(self, mock_logger):
+    @patch('app.services.audit_service.random.random', return_value=0.0)
+    @patch('app.services.audit_service.AsyncJsonLogger._enqueue')
+    def test_audit_event_logging(self, mock_enqueue, mock_random):
         """Test that audit events are logged correctly."""
         # Create a mock request
-        mock_request = MagicMock()
-        mock_request.url.path = "/test"
-        mock_request.method = "GET"
-        mock_request.client.host = "127.0.0.1"
-        mock_request.headers = {"User-Agent": "test-agent"}
+        mock_request = make_request("/test", "GET")
         
         # Log an audit event
         audit_service.log_audit_event(
@@ -79,11 +171,13 @@ class TestAuditService:
             details={"test": "data"}
         )
         
-        # Verify the logger was called
-        mock_logger.info.assert_called_once()
+        audit_service._audit_logger.flush()
+        
+        # Verify the event was queued
+        mock_enqueue.assert_called_once()
         
         # Check the logged data structure
-        logged_data = mock_logger.info.call_args[0][0]
+        logged_data = mock_enqueue.call_args[0][0]
         event_data = json.loads(logged_data)
         
         assert event_data["event_type"] == "data_access"
@@ -96,13 +190,9 @@ class TestAuditService:
     
     def test_cv_processing_logging(self):
         """Test CV processing event logging."""
-        mock_request = MagicMock()
-        mock_request.url.path = "/cv/upload"
-        mock_request.method = "POST"
-        mock_request.client.host = "127.0.0.1"
-        mock_request.headers = {"User-Agent": "test-agent"}
+        mock_request = make_request("/cv/upload", "POST")
         
-        with patch('app.services.audit_service.audit_logger') as mock_logger:
+        with patch('app.services.audit_service.AsyncJsonLogger._enqueue') as mock_enqueue:
             audit_service.log_cv_processing(
                 request=mock_request,
                 user_id="test-user",
@@ -113,21 +203,19 @@ class TestAuditService:
                 file_hash="abc123"
             )
             
-            mock_logger.info.assert_called_once()
-            logged_data = json.loads(mock_logger.info.call_args[0][0])
+            audit_service._audit_logger.flush()
+            
+            mock_enqueue.assert_called_once()
+            logged_data = json.loads(mock_enqueue.call_args[0][0])
             assert logged_data["event_type"] == "cv_upload"
             assert logged_data["resource_id"] == "cv-123"
             assert logged_data["details"]["file_hash"] == "abc123"
     
     def test_search_activity_logging(self):
         """Test search activity logging."""
-        mock_request = MagicMock()
-        mock_request.url.path = "/search"
-        mock_request.method = "POST"
-        mock_request.client.host = "127.0.0.1"
-        mock_request.headers = {"User-Agent": "test-agent"}
+        mock_request = make_request("/search", "POST")
         
-        with patch('app.services.audit_service.audit_logger') as mock_logger:
+        with patch('app.services.audit_service.AsyncJsonLogger._enqueue') as mock_enqueue:
             audit_service.log_search_activity(
                 request=mock_request,
                 user_id="test-user",
@@ -136,11 +224,142 @@ class TestAuditService:
                 results_count=5
             )
             
-            mock_logger.info.assert_called_once()
-            logged_data = json.loads(mock_logger.info.call_args[0][0])
+            audit_service._audit_logger.flush()
+            
+            mock_enqueue.assert_called_once()
+            logged_data = json.loads(mock_enqueue.call_args[0][0])
             assert logged_data["event_type"] == "search_query"
             assert logged_data["details"]["results_count"] == 5
             assert "query_hash" in logged_data["details"]
+    
+    def test_data_access_events_are_sampled(self):
+        """Test that sampled event types are dropped above the sample rate and others are kept."""
+        mock_request = make_request("/profile", "GET")
+        
+        with patch('app.services.audit_service.AsyncJsonLogger._enqueue') as mock_enqueue, \
+                patch('app.services.audit_service.random.random', return_value=0.99):
+            for event_type in (AuditEventType.DATA_ACCESS, AuditEventType.AUTHENTICATION_FAILURE):
+                audit_service.log_audit_event(event_type=event_type, request=mock_request)
+            
+            mock_enqueue.assert_called_once()
+            assert json.loads(mock_enqueue.call_args[0][0])["event_type"] == "authentication_failure"
+    
+    def test_security_event_logging(self):
+        """Test that security events are logged as JSON with UTC datetimes."""
+        mock_request = make_request("/auth/login", "POST")
+        
+        with patch('app.services.audit_service.security_logger') as mock_logger:
+            audit_service.log_security_event(
+                event_type=SecurityEventType.BRUTE_FORCE_ATTACK,
+                severity="LOW",
+                request=mock_request,
+                details={"seen_at": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+            )
+            
+            logged_data = json.loads(mock_logger.warning.call_args[0][0])
+            assert logged_data["event_type"] == "brute_force_attack"
+            assert logged_data["details"]["seen_at"] == "2024-01-01T00:00:00Z"
+    
+    def test_async_json_logger_writes_json_lines(self, tmp_path):
+        """Test that queued events reach the log file as JSON lines."""
+        log_path = tmp_path / "audit.log"
+        audit_logger = AsyncJsonLogger(str(log_path))
+        
+        for i in range(3):
+            audit_logger.log({"event_id": f"evt_{i}", "event_type": AuditEventType.CV_UPLOAD})
+        audit_logger.close()
+        
+        lines = log_path.read_bytes().splitlines()
+        assert [json.loads(line)["event_id"] for line in lines] == ["evt_0", "evt_1", "evt_2"]
+        assert json.loads(lines[0])["event_type"] == "cv_upload"
+    
+    def test_buffer_pool_batches_writes(self, tmp_path):
+        """Test that buffered events are written with one syscall per buffer."""
+        log_path = tmp_path / "audit.log"
+        audit_logger = AsyncJsonLogger(str(log_path), BufferPool(count=2, flush_threshold=64))
+        
+        with patch('app.services.audit_service.os.write', wraps=os.write) as mock_write, \
+                patch('app.services.audit_service.os.writev', wraps=os.writev) as mock_writev:
+            audit_logger.log({"event_id": "evt_0", "padding": "x" * 80})
+            for i in range(1, 20):
+                audit_logger.log({"event_id": f"evt_{i}"})
+            audit_logger.close()
+        
+        lines = log_path.read_bytes().splitlines()
+        assert [json.loads(line)["event_id"] for line in lines] == [f"evt_{i}" for i in range(20)]
+        assert mock_write.call_count + mock_writev.call_count < len(lines)
+    
+    def test_buffer_pool_append_never_waits_for_writer(self):
+        """Test appends keep going without blocking when every pooled buffer is queued."""
+        pool = BufferPool(count=2, flush_threshold=8)
+        
+        start = time.monotonic()
+        for i in range(10):
+            pool.append(f"event_{i}".encode())
+        elapsed = time.monotonic() - start
+        
+        assert elapsed < 0.1
+        buffers = pool.take(include_filling=True)
+        assert b"".join(buffers).splitlines() == [f"event_{i}".encode() for i in range(10)]
+    
+    def test_buffer_pool_concurrent_appends_with_slow_writer(self, tmp_path):
+        """Test that appends during a slow write never touch the buffer being written."""
+        log_path = tmp_path / "audit.log"
+        audit_logger = AsyncJsonLogger(str(log_path), BufferPool(count=2, flush_threshold=64))
+        real_write, real_writev = os.write, os.writev
+        
+        def slow_write(fd, data):
+            time.sleep(0.01)
+            return real_write(fd, data)
+        
+        def slow_writev(fd, buffers):
+            time.sleep(0.01)
+            return real_writev(fd, buffers)
+        
+        errors = []
+        
+        def log_events(thread_id):
+            try:
+                for i in range(50):
+                    audit_logger.log({"event_id": f"evt_{thread_id}_{i}"})
+            except Exception as e:
+                errors.append(e)
+        
+        with patch('app.services.audit_service.os.write', side_effect=slow_write), \
+                patch('app.services.audit_service.os.writev', side_effect=slow_writev):
+            threads = [threading.Thread(target=log_events, args=(t,)) for t in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            audit_logger.close()
+        
+        assert errors == []
+        event_ids = [json.loads(line)["event_id"] for line in log_path.read_bytes().splitlines()]
+        assert sorted(event_ids) == sorted(f"evt_{t}_{i}" for t in range(4) for i in range(50))
+    
+    def test_write_buffers_retries_partial_writes(self, tmp_path):
+        """Test that a short vectored write resumes mid-buffer."""
+        log_path = tmp_path / "audit.log"
+        real_writev = os.writev
+        calls = []
+        
+        def short_then_full_writev(fd, buffers):
+            calls.append(len(buffers))
+            if len(calls) == 1:
+                # Write only the first buffer and half of the second
+                return real_writev(fd, [buffers[0], bytes(buffers[1][:2])])
+            return real_writev(fd, buffers)
+        
+        fd = os.open(log_path, os.O_WRONLY | os.O_CREAT)
+        try:
+            with patch('app.services.audit_service.os.writev', side_effect=short_then_full_writev):
+                _write_buffers(fd, [bytearray(b"one\n"), bytearray(b"two\n"), bytearray(b"three\n")])
+        finally:
+            os.close(fd)
+        
+        assert log_path.read_bytes() == b"one\ntwo\nthree\n"
+        assert calls == [3, 2]
 
 
 class TestSecurityMonitoring:
@@ -176,16 +395,11 @@ class TestSecurityMonitoring:
         # Clear previous events and alerts
         security_monitor.event_history.clear()
         security_monitor.ip_activity.clear()
-        security_monitor.alerts.clear()
-        
-        # Simulate multiple failed login attempts
-        for i in range(12):  # Exceed threshold of 10
-            security_monitor.record_event(
-                event_type="authentication_failure",
-                ip_address="192.168.1.100",
-                user_agent="test-agent",
-                endpoint="/auth/login"
-            )
+        security_monitor.clear_alerts()
+        security_monitor.ip_failure_buckets.clear()
+        
+        # Simulate multiple failed login attempts, exceeding the threshold of 10
+        _record_failed_logins("192.168.1.100", 12)
         
         # Check that IP was blocked and alert was created
         assert "192.168.1.100" in security_monitor.blocked_ips
@@ -198,6 +412,40 @@ class TestSecurityMonitoring:
         ]
         assert len(brute_force_alerts) > 0
         assert brute_force_alerts[0].level == "CRITICAL"
+        assert security_monitor.alerts_of_type("brute_force_attack_ip") == brute_force_alerts
+    
+    def test_failure_bucket_triggers_at_threshold_and_refills(self):
+        """Test that the failed login bucket trips on the threshold-th burst failure."""
+        buckets = {}
+        now = 1_000_000.0
+        
+        tokens = [
+            security_monitor._consume_failure_token(buckets, "10.0.0.3", 10, now)
+            for _ in range(10)
+        ]
+        
+        assert all(t >= 0 for t in tokens[:9])
+        assert tokens[9] < 0
+        
+        # A full window later the bucket has refilled
+        assert security_monitor._consume_failure_token(buckets, "10.0.0.3", 10, now + 3600) >= 0
+    
+    def test_activity_cleanup_trims_expired_events(self):
+        """Test that cleanup drops expired events in place and empty keys entirely."""
+        security_monitor.ip_activity.clear()
+        now = time.time()
+        
+        security_monitor.ip_activity["10.0.0.1"].extend(
+            {"timestamp": now - age} for age in (90000, 87000, 60, 1)
+        )
+        security_monitor.ip_activity["10.0.0.2"].append({"timestamp": now - 90000})
+        activity = security_monitor.ip_activity["10.0.0.1"]
+        
+        security_monitor._cleanup_old_data(now)
+        
+        assert security_monitor.ip_activity["10.0.0.1"] is activity
+        assert len(activity) == 2
+        assert "10.0.0.2" not in security_monitor.ip_activity
     
     def test_security_dashboard(self):
         """Test security dashboard data."""
@@ -221,12 +469,53 @@ class TestSecurityMonitoring:
         assert "unique_ips_last_hour" in dashboard["activity"]
 
 
+    def test_alert_type_index_follows_evictions(self):
+        """Test that alerts overwritten in the ring also leave the type index."""
+        original_alerts = security_monitor.alerts
+        security_monitor.alerts = deque(maxlen=2)
+        security_monitor.alerts_by_type.clear()
+        try:
+            for alert_type in ("scan", "rate", "scan"):
+                security_monitor._create_alert(
+                    alert_type=alert_type,
+                    level=AlertLevel.LOW,
+                    message=alert_type,
+                    details={},
+                    source_events=[]
+                )
+            
+            assert [a.alert_type for a in security_monitor.alerts] == ["rate", "scan"]
+            assert len(security_monitor.alerts_of_type("scan")) == 1
+            assert security_monitor.alerts_of_type("scan")[0] is security_monitor.alerts[1]
+        finally:
+            security_monitor.alerts = original_alerts
+            security_monitor.alerts_by_type.clear()
+    
+    def test_security_dashboard_cached_within_ttl(self):
+        """Test that dashboard polls within the TTL reuse the computed dashboard."""
+        security_monitor._dashboard_cache = (float("-inf"), None)
+        first = security_monitor.get_security_dashboard()
+        second = security_monitor.get_security_dashboard()
+        
+        assert second is first
+        
+        # Age the cached dashboard past its TTL
+        built_at, dashboard = security_monitor._dashboard_cache
+        security_monitor._dashboard_cache = (built_at - DASHBOARD_CACHE_TTL_SECONDS, dashboard)
+        third = security_monitor.get_security_dashboard()
+        
+        assert third is not first
+        assert third.keys() == first.keys()
+
+
 class TestSecurityEndpoints:
     """Test security API endpoints."""
     
-    def test_security_health_endpoint(self):
+    @pytest.mark.asyncio
+    async def test_security_health_endpoint(self):
         """Test security health check endpoint."""
-        response = client.get("/security/health")
+        async with _async_client() as async_client:
+            response = await async_client.get("/security/health")
         assert response.status_code == 200
         
         data = response.json()
@@ -234,30 +523,30 @@ class TestSecurityEndpoints:
         assert "timestamp" in data
         assert "monitoring_active" in data
     
-    @patch('app.api.security.get_current_user')
-    def test_security_dashboard_endpoint(self, mock_get_user):
+    def test_security_dashboard_endpoint(self, authed_client):
         """Test security dashboard endpoint."""
-        # Mock authenticated user
-        mock_user = MagicMock()
-        mock_user.id = "test-user"
-        mock_get_user.return_value = mock_user
-        
-        response = client.get("/security/dashboard")
+        response = authed_client.get("/security/dashboard")
         assert response.status_code == 200
         
         data = response.json()
         assert "alerts" in data
         assert "activity" in data
     
-    @patch('app.api.security.get_current_user')
-    def test_blocked_ips_endpoint(self, mock_get_user):
-        """Test blocked IPs endpoint."""
-        # Mock authenticated user
-        mock_user = MagicMock()
-        mock_user.id = "test-user"
-        mock_get_user.return_value = mock_user
+    def test_alerts_endpoint_filters_by_type(self, authed_client):
+        """Test that the alerts endpoint can filter by alert type."""
+        security_monitor.clear_alerts()
+        _record_failed_logins("192.168.1.101", 10)
         
-        response = client.get("/security/blocked-ips")
+        response = authed_client.get("/security/alerts", params={"alert_type": "brute_force_attack_ip"})
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert len(data) > 0
+        assert all(alert["alert_type"] == "brute_force_attack_ip" for alert in data)
+    
+    def test_blocked_ips_endpoint(self, authed_client):
+        """Test blocked IPs endpoint."""
+        response = authed_client.get("/security/blocked-ips")
         assert response.status_code == 200
         
         data = response.json()
@@ -8,15 +8,23 @@ import argparse
 from pathlib import Path
 
 
+# Backend virtual environment interpreter, relative to the backend directory
+VENV_PYTHON = Path("venv") / ("Scripts" if os.name == "nt" else "bin") / "python"
+
+
+def venv_python(backend_dir):
+    """Return the absolute path of the backend virtual environment interpreter."""
+    return str((backend_dir / VENV_PYTHON).absolute())
+
+
 def run_command(command, cwd=None, description=None):
-    """Run a shell command and handle errors."""
+    """Run a command given as an argument list, without a shell, and handle errors."""
     if description:
         print(f"Running: {description}")
     
     try:
         result = subprocess.run(
-            command, 
-            shell=True, 
+            command,
             check=True, 
             cwd=cwd,
             capture_output=False
@@ -25,6 +33,9 @@ def run_command(command, cwd=None, description=None):
     except subprocess.CalledProcessError as e:
         print(f"Error: Command failed with exit code {e.returncode}")
         return False
+    except FileNotFoundError as e:
+        print(f"Error: Command not found: {e.filename}")
+        return False
 
 
 def start_backend():
@@ -36,8 +47,11 @@ def start_backend():
         print("Error: backend directory not found")
         return False
     
-    # Activate virtual environment and start server
-    command = "source venv/bin/activate && uvicorn main:app --reload --host 0.0.0.0 --port 8000"
+    # Start server with the virtual environment's interpreter
+    command = [
+        venv_python(backend_dir), "-m", "uvicorn", "main:app",
+        "--reload", "--host", "0.0.0.0", "--port", "8000"
+    ]
     return run_command(command, cwd=backend_dir, description="Starting backend server")
 
 
@@ -53,10 +67,10 @@ def start_frontend():
     # Check if node_modules exists
     if not (frontend_dir / "node_modules").exists():
         print("Installing frontend dependencies...")
-        if not run_command("npm install", cwd=frontend_dir):
+        if not run_command(["npm", "install"], cwd=frontend_dir):
             return False
     
-    return run_command("npm start", cwd=frontend_dir, description="Starting frontend server")
+    return run_command(["npm", "start"], cwd=frontend_dir, description="Starting frontend server")
 
 
 def run_tests():
@@ -64,7 +78,7 @@ def run_tests():
     print("Running backend tests...")
     backend_dir = Path("backend")
     
-    command = "source venv/bin/activate && python -m pytest tests/ -v"
+    command = [venv_python(backend_dir), "-m", "pytest", "tests/", "-v"]
     return run_command(command, cwd=backend_dir, description="Running tests")
 
 
@@ -73,10 +87,11 @@ def lint_code():
     print("Running code formatting and linting...")
     backend_dir = Path("backend")
     
+    python = venv_python(backend_dir)
     commands = [
-        ("source venv/bin/activate && black .", "Formatting with black"),
-        ("source venv/bin/activate && isort .", "Sorting imports with isort"),
-        ("source venv/bin/activate && flake8 .", "Linting with flake8"),
+        ([python, "-m", "black", "."], "Formatting with black"),
+        ([python, "-m", "isort", "."], "Sorting imports with isort"),
+        ([python, "-m", "flake8", "."], "Linting with flake8"),
     ]
     
     for command, description in commands:
@@ -94,10 +109,11 @@ def setup_project():
     backend_dir = Path("backend")
     if backend_dir.exists():
         print("Setting up backend...")
+        python = venv_python(backend_dir)
         commands = [
-            ("python -m venv venv", "Creating virtual environment"),
-            ("source venv/bin/activate && pip install -r requirements.txt", "Installing dependencies"),
-            ("source venv/bin/activate && pip install black isort flake8 mypy", "Installing dev tools"),
+            ([sys.executable, "-m", "venv", "venv"], "Creating virtual environment"),
+            ([python, "-m", "pip", "install", "-r", "requirements.txt"], "Installing dependencies"),
+            ([python, "-m", "pip", "install", "black", "isort", "flake8", "mypy"], "Installing dev tools"),
         ]
         
         for command, description in commands:
@@ -108,7 +124,7 @@ def setup_project():
     frontend_dir = Path("frontend")
     if frontend_dir.exists():
         print("Setting up frontend...")
-        if not run_command("npm install", cwd=frontend_dir, description="Installing frontend dependencies"):
+        if not run_command(["npm", "install"], cwd=frontend_dir, description="Installing frontend dependencies"):
             return False
     
     print("✓ Project setup complete!")
@@ -135,7 +151,7 @@ def main():
     elif args.command == "lint":
         success = lint_code()
     elif args.command == "verify":
-        success = run_command("python verify_setup.py", description="Running setup verification")
+        success = run_command([sys.executable, "verify_setup.py"], description="Running setup verification")
     else:
         print(f"Unknown command: {args.command}")
         success = False
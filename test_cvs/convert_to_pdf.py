@@ -2,12 +2,74 @@
 """Convert text CV files to PDF format."""
 
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.enums import TA_LEFT, TA_CENTER
 
+# Paragraph styles shared by every converted CV
+_styles = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'CVTitle',
+    parent=_styles['Heading1'],
+    fontSize=16,
+    alignment=TA_CENTER,
+    spaceAfter=12
+)
+
+HEADING_STYLE = ParagraphStyle(
+    'CVHeading',
+    parent=_styles['Heading2'],
+    fontSize=12,
+    spaceBefore=12,
+    spaceAfter=6,
+    textColor='#2c3e50'
+)
+
+NORMAL_STYLE = ParagraphStyle(
+    'CVNormal',
+    parent=_styles['Normal'],
+    fontSize=10,
+    leading=14,
+    spaceAfter=4
+)
+
+# Words that mark a "Title | Company" line as a job title
+JOB_KEYWORDS = frozenset({
+    'Engineer', 'Manager', 'Analyst', 'Designer', 'Scientist', 'Executive',
+    'Coordinator', 'Specialist', 'Administrator'
+})
+
+# Matches any job keyword anywhere in a line in a single scan
+JOB_KEYWORD_RE = re.compile('|'.join(sorted(JOB_KEYWORDS)))
+
+# Escapes reportlab markup characters in one pass
+_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+def line_to_flowable(line):
+    """Build the reportlab flowable for one stripped line of a text CV."""
+    if not line:
+        return Spacer(1, 6)
+    
+    # Escape special characters for reportlab
+    line = line.translate(_ESCAPE_TABLE)
+    
+    # Determine style based on content
+    if line == 'CURRICULUM VITAE':
+        return Paragraph(line, TITLE_STYLE)
+    if line.isupper() and len(line) > 3:
+        return Paragraph(f"<b>{line}</b>", HEADING_STYLE)
+    if line.startswith('- '):
+        return Paragraph(f"• {line[2:]}", NORMAL_STYLE)
+    if '|' in line and JOB_KEYWORD_RE.search(line):
+        # Job title line
+        return Paragraph(f"<b>{line}</b>", NORMAL_STYLE)
+    return Paragraph(line, NORMAL_STYLE)
+
 def convert_txt_to_pdf(txt_path, pdf_path):
     """Convert a text file to PDF."""
     # Read the text content
@@ -24,80 +86,33 @@ def convert_txt_to_pdf(txt_path, pdf_path):
         bottomMargin=0.75*inch
     )
     
-    # Create styles
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CVTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        alignment=TA_CENTER,
-        spaceAfter=12
-    )
-    
-    heading_style = ParagraphStyle(
-        'CVHeading',
-        parent=styles['Heading2'],
-        fontSize=12,
-        spaceBefore=12,
-        spaceAfter=6,
-        textColor='#2c3e50'
-    )
-    
-    normal_style = ParagraphStyle(
-        'CVNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        leading=14,
-        spaceAfter=4
-    )
-    
     # Build the PDF content
-    story = []
-    lines = content.split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            story.append(Spacer(1, 6))
-            continue
-        
-        # Escape special characters for reportlab
-        line = line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        
-        # Determine style based on content
-        if line == 'CURRICULUM VITAE':
-            story.append(Paragraph(line, title_style))
-        elif line.isupper() and len(line) > 3:
-            story.append(Paragraph(f"<b>{line}</b>", heading_style))
-        elif line.startswith('- '):
-            story.append(Paragraph(f"• {line[2:]}", normal_style))
-        elif '|' in line and any(word in line for word in ['Engineer', 'Manager', 'Analyst', 'Designer', 'Scientist', 'Executive', 'Coordinator', 'Specialist', 'Administrator']):
-            # Job title line
-            story.append(Paragraph(f"<b>{line}</b>", normal_style))
-        else:
-            story.append(Paragraph(line, normal_style))
+    story = [line_to_flowable(line.strip()) for line in content.split('\n')]
     
     # Build PDF
     doc.build(story)
     print(f"Created: {pdf_path}")
 
+def convert_one(txt_path):
+    """Convert one text CV to a PDF alongside it, reporting errors instead of raising."""
+    pdf_path = txt_path[:-len('.txt')] + '.pdf'
+    try:
+        convert_txt_to_pdf(txt_path, pdf_path)
+    except Exception as e:
+        print(f"Error converting {os.path.basename(txt_path)}: {e}")
+
 def main():
-    """Convert all text CVs to PDF."""
+    """Convert all text CVs to PDF, one worker process per core."""
     script_dir = os.path.dirname(os.path.abspath(__file__))
     
     # Find all .txt files
-    txt_files = [f for f in os.listdir(script_dir) if f.endswith('.txt')]
+    txt_paths = [
+        os.path.join(script_dir, f)
+        for f in sorted(os.listdir(script_dir)) if f.endswith('.txt')
+    ]
     
-    for txt_file in sorted(txt_files):
-        txt_path = os.path.join(script_dir, txt_file)
-        pdf_file = txt_file.replace('.txt', '.pdf')
-        pdf_path = os.path.join(script_dir, pdf_file)
-        
-        try:
-            convert_txt_to_pdf(txt_path, pdf_path)
-        except Exception as e:
-            print(f"Error converting {txt_file}: {e}")
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(convert_one, txt_paths))
 
 if __name__ == '__main__':
     main()